@@ -15,20 +15,47 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import sys
 import json
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+import tempfile
+from functools import partial
+from operator import attrgetter
+from types import MappingProxyType
+from PyQt6.QtCore import QCoreApplication, QObject, pyqtSignal, QTimer
 
 from UM.Logger import Logger
 from cura.CuraApplication import CuraApplication
 from cura.Machines.ContainerTree import ContainerTree
+from cura.Settings.ExtruderManager import ExtruderManager
 from UM.Scene.Iterator.DepthFirstIterator import DepthFirstIterator
 
 
 from .ProfileSwitchingService import ProfileSwitchingService
 from .HellaFusionExceptions import ProfileSwitchError
-from .TransitionCalculator import TransitionCalculator
+from .TransitionCalculator import TransitionCalculator, find_overlapping_sections
 from .ProfileValidatorService import ProfileValidatorService
 from .TransitionData import TransitionData
+from .QualityProfileEntry import QualityProfileEntry
+
+# Display names for Cura intent categories (read-only view)
+_INTENT_MAPPING = MappingProxyType({
+    "default": "Balanced",
+    "engineering": "Engineering",
+    "accurate": "Engineering",
+    "draft": "Draft",
+    "quick": "Draft",
+    "balanced": "Balanced",
+    "fast": "Fast", 
+    "fine": "Fine",
+    "high_quality": "High Quality",
+    "smooth": "Smooth",
+    "strong": "Strong",
+    "visual": "Visual"
+})
+
+# Intent categories shown as the default "Balanced" intent
+_DEFAULT_INTENTS = frozenset({None, "", "default"})
+
 
 class HellaFusionController(QObject):
     """Controller class that handles all business logic for the HellaFusion plugin."""
@@ -39,6 +66,11 @@ class HellaFusionController(QObject):
     
     # Settings file path
     SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "hellafusion_settings.json")
+    SETTINGS_SAVE_DELAY_MS = 250  # Coalesce rapid saveSettings calls into one write
+    PROFILE_RELOAD_DELAY_MS = 1000  # Wait this long for more change signals before reloading
+    
+    # Definition ID -> tuple of inherited definition IDs, shared by all controllers
+    _inherits_cache = {}
     
     def __init__(self):
         super().__init__()
@@ -46,7 +78,32 @@ class HellaFusionController(QObject):
         self._profile_service = ProfileSwitchingService()
         self._validator_service = ProfileValidatorService()
         self._is_loading_profiles = False  # Guard flag to prevent simultaneous loads
-        self._reload_timer = None  # Timer for debouncing reload requests
+        
+        # Timer for debouncing reload requests
+        self._reload_timer = QTimer()
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.PROFILE_RELOAD_DELAY_MS)
+        self._reload_timer.timeout.connect(self._loadQualityProfiles)
+        
+        self._reload_pending = False  # Reload requested while a scan was running
+        self._profile_cache = {}  # (machine_id, variants, materials) -> list of QualityProfileEntry
+        
+        # ContainerTree variant/material nodes from the last profile scan
+        self._cached_material_node_key = None  # (machine_id, variant_name, material_base)
+        self._cached_material_nodes = (None, None)  # (variant_node, material_node)
+        self._transition_calculator = TransitionCalculator()  # Reused so unchanged sections hit its cache
+        self._compatible_definitions_cache = {}  # (machine_definition_id, definition_id) -> frozenset
+        self._machine_definition_matches = {}  # fdmprinter machine name -> (definition_id, name) or None
+        
+        # In-memory settings, written to disk shortly after the last change
+        self._settings_cache = None
+        self._settings_cache_key = None  # (st_mtime_ns, st_size) of the file the cache matches
+        self._settings_save_timer = QTimer()
+        self._settings_save_timer.setSingleShot(True)
+        self._settings_save_timer.timeout.connect(self.flushSettings)
+        application = QCoreApplication.instance()
+        if application is not None:
+            application.aboutToQuit.connect(self.flushSettings)
 
         # Connect to machine change signals for automatic profile reloading
         self._connectMachineChangeSignals()
@@ -59,38 +116,75 @@ class HellaFusionController(QObject):
         return self._quality_profiles
     
     def loadSettings(self):
-        """Load saved settings from JSON file."""
+        """Load saved settings, re-reading the JSON file only when it changed on disk."""
+        # Unsaved changes are newer than whatever is on disk
+        if self._settings_cache is not None and self._settings_save_timer.isActive():
+            return dict(self._settings_cache)
+        
         try:
-            if os.path.exists(self.SETTINGS_FILE):
-                with open(self.SETTINGS_FILE, 'r') as f:
-                    settings = json.load(f)
-                return settings
-            else:
-                return {}
-        except Exception as e:
+            stat = os.stat(self.SETTINGS_FILE)
+        except FileNotFoundError:
+            if self._settings_cache is None:
+                self._settings_cache = {}
+            return dict(self._settings_cache)
+        except OSError as e:
             Logger.log("w", f"Failed to load HellaFusion settings: {str(e)}")
             return {}
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._settings_cache is None or key != self._settings_cache_key:
+            try:
+                with open(self.SETTINGS_FILE, 'r') as f:
+                    self._settings_cache = json.load(f)
+                self._settings_cache_key = key
+            except Exception as e:
+                Logger.log("w", f"Failed to load HellaFusion settings: {str(e)}")
+                return {}
+        return dict(self._settings_cache)
     
     def saveSettings(self, settings):
-        """Save current settings to JSON file."""
+        """Save current settings; the file is written once changes settle."""
+        self._settings_cache = dict(settings)
+        self._settings_cache_key = None
+        self._settings_save_timer.start(self.SETTINGS_SAVE_DELAY_MS)
+    
+    def flushSettings(self):
+        """Write pending settings to the JSON file immediately."""
+        self._settings_save_timer.stop()
+        if self._settings_cache is None or self._settings_cache_key is not None:
+            return  # Nothing loaded, or the file already matches the cache
+        
         try:
-            with open(self.SETTINGS_FILE, 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Serialize once, write in one call, then atomically replace the old file
+            data = json.dumps(self._settings_cache, indent=2)
+            temp_file = self.SETTINGS_FILE + ".tmp"
+            with open(temp_file, 'w') as f:
+                f.write(data)
+            os.replace(temp_file, self.SETTINGS_FILE)
+            stat = os.stat(self.SETTINGS_FILE)
+            self._settings_cache_key = (stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             Logger.log("w", f"Failed to save HellaFusion settings: {str(e)}")
     
     def validateStartProcessing(self, dest_folder, transitions):
         """Validate inputs before starting processing."""
         
+        # Without profiles or sections there is nothing meaningful to validate per section
+        if not self._quality_profiles:
+            return ["No quality profiles available. Please wait for profiles to load or click 'Reload Profiles'."]
+        if not transitions:
+            return ["Please add at least one section"]
+        
         errors = []
         
         # Check if model exists on build plate
         try:
             application = CuraApplication.getInstance()
             scene = application.getController().getScene()
-            nodes = [node for node in DepthFirstIterator(scene.getRoot()) if node.getMeshData()]
+            # Stop at the first node carrying mesh data instead of collecting them all
+            has_model = any(node.getMeshData() for node in DepthFirstIterator(scene.getRoot()))
             
-            if not nodes:
+            if not has_model:
                 errors.append("No model on build plate. Please load a model first.")
         except Exception as e:
             Logger.log("e", f"Error checking for model: {e}")
@@ -105,70 +199,57 @@ class HellaFusionController(QObject):
             errors.append(f"Destination folder does not exist: {dest_folder}")
         else:
             # Check if folder is writable
-            try:
-                test_file = os.path.join(dest_folder, "test_write.tmp")
-                with open(test_file, 'w') as f:
-                    f.write("test")
-                os.remove(test_file)
-            except Exception as e:
+            if not os.access(dest_folder, os.W_OK):
                 errors.append(f"Cannot write to destination folder: {dest_folder}")
+            elif sys.platform == "win32":
+                # os.access ignores Windows ACLs, so confirm with a real (self-deleting) file
+                try:
+                    with tempfile.NamedTemporaryFile(dir=dest_folder):
+                        pass
+                except OSError:
+                    errors.append(f"Cannot write to destination folder: {dest_folder}")
         
-        # Validate transitions
-        if not transitions:
-            errors.append("Please add at least one section")
-        else:
-            # Validate each transition
-            for i, transition in enumerate(transitions):
-                section_num = transition.get('section_number', i + 1)
-                
-                # Check profile selection
-                if not transition.get('profile_id'):
-                    errors.append(f"Section {section_num}: Please select a quality profile")
-                
-                # Check transition heights are valid
-                start_height = transition.get('start_height', 0)
-                end_height = transition.get('end_height')
-                
-                if end_height is not None:
-                    if end_height <= start_height:
-                        errors.append(f"Section {section_num}: End height ({end_height}mm) must be greater than start height ({start_height}mm)")
-                    
-                    if end_height > 1000:  # Reasonable maximum
-                        errors.append(f"Section {section_num}: Transition height ({end_height}mm) seems unusually high")
+        # Read each transition's heights once (a missing start height counts as 0)
+        heights = [(transition.get('start_height') or 0, transition.get('end_height'))
+                   for transition in transitions]
+        overlapping = find_overlapping_sections(heights)
+        
+        # Validate each transition
+        add_error = errors.append
+        for i, transition in enumerate(transitions):
+            get = transition.get
+            section_num = get('section_number', i + 1)
+            start_height, end_height = heights[i]
+            
+            # Check profile selection
+            if not get('profile_id'):
+                add_error(f"Section {section_num}: Please select a quality profile")
+            
+            # Check transition heights are valid
+            if end_height is not None:
+                if end_height <= start_height:
+                    add_error(f"Section {section_num}: End height ({end_height}mm) must be greater than start height ({start_height}mm)")
                 
-                # Check for overlapping transitions
-                if i > 0:
-                    prev_end = transitions[i-1].get('end_height')
-                    if prev_end and start_height < prev_end:
-                        errors.append(f"Section {section_num}: Overlapping transition heights detected")
+                if end_height > 1000:  # Reasonable maximum
+                    add_error(f"Section {section_num}: Transition height ({end_height}mm) seems unusually high")
             
-        # Check quality profiles availability
-        if not self._quality_profiles:
-            errors.append("No quality profiles available. Please wait for profiles to load or click 'Reload Profiles'.")
+            # Check for overlapping transitions
+            if i in overlapping:
+                add_error(f"Section {section_num}: Overlapping transition heights detected")
         
         return errors
     
     def normalizeIntentName(self, intent_category):
         """Normalize intent category names for display."""
-        if not intent_category or intent_category in ["", "default"]:
+        if intent_category in _DEFAULT_INTENTS:
             return "Balanced"
         
-        intent_mapping = {
-            "default": "Balanced",
-            "engineering": "Engineering",
-            "accurate": "Engineering",
-            "draft": "Draft",
-            "quick": "Draft",
-            "balanced": "Balanced",
-            "fast": "Fast", 
-            "fine": "Fine",
-            "high_quality": "High Quality",
-            "smooth": "Smooth",
-            "strong": "Strong",
-            "visual": "Visual"
-        }
-        
-        return intent_mapping.get(intent_category.lower(), intent_category.title())
+        # Most categories are already canonical lowercase keys; avoid lower() for those
+        display_name = _INTENT_MAPPING.get(intent_category)
+        if display_name is not None:
+            return display_name
+        
+        return _INTENT_MAPPING.get(intent_category.lower(), intent_category.title())
     
     def _logMessage(self, message, is_error=False):
         """Emit a log message signal."""
@@ -176,28 +257,30 @@ class HellaFusionController(QObject):
         if is_error:
             Logger.log("e", message)
     
-    def _loadQualityProfilesAsync(self):
+    def _logMessages(self, lines, is_error=False):
+        """Emit several log lines as a single log message signal."""
+        self._logMessage("\n".join(lines), is_error)
+    
+    def _loadQualityProfilesAsync(self, force=False):
         """Load quality profiles asynchronously with debouncing to avoid blocking the UI.
         
         Debouncing ensures that multiple rapid reload requests (e.g., during Cura startup
         when many containers are added) are collapsed into a single load operation.
+        
+        Args:
+            force: Rescan even if profiles for the current configuration are cached
         """
-        # If a load is already in progress, ignore new requests
+        if force:
+            self._profile_cache.clear()
+        
+        # If a load is already in progress, reload once it has finished
         if self._is_loading_profiles:
+            self._reload_pending = True
             return
         
-        # Cancel any pending reload timer
-        if self._reload_timer is not None:
-            try:
-                self._reload_timer.stop()
-            except:
-                pass
-
-        # Create new timer for debounced reload (1 second delay)
-        self._reload_timer = QTimer()
-        self._reload_timer.setSingleShot(True)
-        self._reload_timer.timeout.connect(self._loadQualityProfiles)
-        self._reload_timer.start(1000)  # Wait 1 second for more requests before loading
+        # (Re)start the debounce timer; restarting a running single-shot timer
+        # pushes the reload back, so a burst of requests ends in one load
+        self._reload_timer.start()
     
     def _connectMachineChangeSignals(self):
         """Connect to machine change signals to automatically update quality profiles."""
@@ -213,6 +296,14 @@ class HellaFusionController(QObject):
             if hasattr(machine_manager, 'globalContainerChanged'):
                 machine_manager.globalContainerChanged.connect(self._onMachineChanged)
             
+            if hasattr(machine_manager, 'activeMachineChanged'):
+                machine_manager.activeMachineChanged.connect(self._onActiveMachineChanged)
+            
+            # Extruder switches change which variant/material node applies
+            extruder_manager = ExtruderManager.getInstance()
+            if hasattr(extruder_manager, 'activeExtruderChanged'):
+                extruder_manager.activeExtruderChanged.connect(self._invalidateMaterialNodeCache)
+            
             # Connect to container tree changes (when profiles are added/modified)
             container_tree = ContainerTree.getInstance()
             if hasattr(container_tree, 'containerTreeChanged'):
@@ -223,6 +314,9 @@ class HellaFusionController(QObject):
             if hasattr(container_registry, 'containerAdded'):
                 container_registry.containerAdded.connect(self._onContainerAdded)
             
+            if hasattr(container_registry, 'containerRemoved'):
+                container_registry.containerRemoved.connect(self._onContainerRemoved)
+            
             if hasattr(container_registry, 'containerMetaDataChanged'):
                 container_registry.containerMetaDataChanged.connect(self._onContainerMetaDataChanged)
             
@@ -232,66 +326,180 @@ class HellaFusionController(QObject):
     def _onMachineChanged(self):
         """Handle machine change events by refreshing quality profiles."""
         try:
+            # Cached profile reads depend on the active machine configuration
+            self._validator_service.invalidate_cache()
+            self._compatible_definitions_cache.clear()
+            self._invalidateMaterialNodeCache()
+            # Also fired for ContainerTree rebuilds, which can add quality/intent nodes
+            # without changing the (machine, variants, materials) cache key
+            self._profile_cache.clear()
+            
             # Use debounced async reload to handle multiple rapid machine changes
             self._loadQualityProfilesAsync()
 
         except Exception as e:
             Logger.log("e", f"Error handling machine change: {e}")
 
+    def _invalidateMaterialNodeCache(self):
+        """Forget the cached ContainerTree variant/material nodes."""
+        self._cached_material_node_key = None
+        self._cached_material_nodes = (None, None)
+
     def _onContainerAdded(self, container):
         """Handle new container added - reload if it's a quality_changes profile."""
         try:
-            # Check if it's a quality_changes container (custom profile)
-            if container and hasattr(container, 'getMetaDataEntry'):
-                container_type = container.getMetaDataEntry("type", "")
-                if container_type == "quality_changes":
-                    # Use debounced async reload to batch multiple container additions
-                    self._loadQualityProfilesAsync()
+            # Check if it's a quality_changes container (custom profile); one metadata fetch per event
+            metadata = container.getMetaData() if container and hasattr(container, 'getMetaData') else None
+            if metadata and metadata.get("type") == "quality_changes":
+                self._validator_service.invalidate_cache()
+                self._profile_cache.clear()
+                # Use debounced async reload to batch multiple container additions
+                self._loadQualityProfilesAsync()
+            elif metadata and metadata.get("type") == "machine":
+                # A new machine definition may match a generic fdmprinter machine name
+                self._machine_definition_matches.clear()
 
         except Exception as e:
             Logger.log("w", f"Error handling container added: {e}")
 
+    def _onContainerRemoved(self, container):
+        """Handle container removed - reload if it was a quality_changes profile."""
+        try:
+            metadata = container.getMetaData() if container and hasattr(container, 'getMetaData') else None
+            if metadata and metadata.get("type") == "quality_changes":
+                self._validator_service.invalidate_cache()
+                self._profile_cache.clear()
+                # Use debounced async reload to batch multiple container removals
+                self._loadQualityProfilesAsync()
+
+        except Exception as e:
+            Logger.log("w", f"Error handling container removed: {e}")
+
     def _onContainerMetaDataChanged(self, container):
         """Handle container metadata changed - reload if it's a quality_changes profile."""
         try:
-            # Check if it's a quality_changes container (custom profile update)
-            if container and hasattr(container, 'getMetaDataEntry'):
-                container_type = container.getMetaDataEntry("type", "")
-                if container_type == "quality_changes":
-                    # Use debounced async reload to batch multiple metadata changes
-                    self._loadQualityProfilesAsync()
+            # Check if it's a quality_changes container (custom profile update); one metadata fetch per event
+            metadata = container.getMetaData() if container and hasattr(container, 'getMetaData') else None
+            if metadata and metadata.get("type") == "quality_changes":
+                self._validator_service.invalidate_cache()
+                self._profile_cache.clear()
+                # Use debounced async reload to batch multiple metadata changes
+                self._loadQualityProfilesAsync()
 
         except Exception as e:
             Logger.log("w", f"Error handling container metadata changed: {e}")
 
     def _buildCompatibleDefinitionsList(self, machine_definition_id, global_stack):
-        """Build a list of compatible definition IDs using Cura's proper inheritance chain."""
+        """Build the set of compatible definition IDs using Cura's proper inheritance chain.
+        
+        The result is memoized per machine definition until the machine changes.
+        """
         current_definition = global_stack.definition
+        cache_key = (machine_definition_id, current_definition.getId())
+        cached = self._compatible_definitions_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         quality_definition = current_definition.getMetaDataEntry("quality_definition", machine_definition_id)
         
-        compatible_definitions = [machine_definition_id]
+        compatible_definitions = {machine_definition_id}
+        if quality_definition:
+            compatible_definitions.add(quality_definition)
+        compatible_definitions.update(self._getInheritedDefinitions(current_definition))
+        
+        compatible_definitions = frozenset(compatible_definitions)
+        self._compatible_definitions_cache[cache_key] = compatible_definitions
+        return compatible_definitions
+
+    def _buildQualityChangesEntry(self, metadata, container_registry, accepted_definitions, available_quality_types):
+        """Build the profile entry for a quality_changes container from its metadata.
+        
+        The filters only need metadata, so the container itself is only loaded
+        (fetched from the registry by ID) once it is known to be selectable.
+        Returns None if the container is not a selectable global profile for the
+        current machine configuration.
+        """
+        # Skip if this is an extruder-specific container (we want global ones)
+        if metadata.get("position") is not None:
+            return None
+        
+        # Check if the quality_changes definition matches any compatible definition
+        if metadata.get("definition", "unknown") not in accepted_definitions:
+            return None
         
-        if quality_definition and quality_definition not in compatible_definitions:
-            compatible_definitions.append(quality_definition)
+        # Check if the quality_type is available for current nozzle/material combination
+        quality_type = metadata.get("quality_type", "normal")
+        if available_quality_types and quality_type not in available_quality_types:
+            return None
+        
+        container_id = metadata.get("id")
+        quality_name = metadata.get("name", container_id)
+        intent_category = metadata.get("intent_category", "default")
+        
+        # Filter out unwanted profiles
+        if not quality_name or quality_name.lower() in ["empty", "not_supported"] or intent_category == "Not_Supported":
+            return None
+        
+        try:
+            containers = container_registry.findInstanceContainers(id=container_id)
+        except Exception as qc_error:
+            Logger.log("w", f"Error processing quality changes container {container_id}: {qc_error}")
+            return None
+        if not containers:
+            return None
+        
+        # Enhanced intent detection for quality changes
+        if intent_category == "default" or not intent_category:
+            alt_intent = metadata.get("intent", "")
+            if alt_intent and alt_intent != "default":
+                intent_category = alt_intent
+            else:
+                intent_category = "default"
+        
+        # Create a profile entry for quality changes (user-defined)
+        return QualityProfileEntry(
+            display_name=f"* {quality_name}",  # Star indicates user-defined
+            container=containers[0],
+            intent=intent_category,
+            quality_name=quality_name,
+            quality_type=quality_type,
+            is_user_defined=True
+        )
+
+    def _getInheritedDefinitions(self, definition):
+        """Get the inherited definition IDs of a definition, cached by definition ID."""
+        definition_id = definition.getId()
+        inherited = self._inherits_cache.get(definition_id)
+        if inherited is not None:
+            return inherited
         
         try:
             # Use metadata to get inheritance chain
-            inherited_from = current_definition.getMetaDataEntry("inherits", "")
-            if inherited_from and inherited_from not in compatible_definitions:
-                compatible_definitions.append(inherited_from)
+            inherited_from = definition.getMetaDataEntry("inherits", "")
+            inherited = (inherited_from,) if inherited_from else ()
         except Exception as ancestor_error:
             Logger.log("w", f"Could not get inheritance chain: {ancestor_error}")
+            return ()
         
-        return compatible_definitions
+        self._inherits_cache[definition_id] = inherited
+        return inherited
+
+    def _onActiveMachineChanged(self):
+        """Drop cached definition inheritance when a different machine becomes active."""
+        self._inherits_cache.clear()
 
     def _loadQualityProfiles(self):
-        """Load available quality profiles using the proper Cura API (from AutoSlicer)."""
+        """Load available quality profiles for the active machine configuration.
+        
+        Runs on the main thread: the scan walks the ContainerTree and the container
+        registry, which may create container QObjects and must not race with the
+        cache invalidation done by the change signal handlers.
+        """
         # Prevent simultaneous loading
         if self._is_loading_profiles:
             return
 
         try:
-            self._is_loading_profiles = True
             self._logMessage("Loading quality profiles...")
             
             application = CuraApplication.getInstance()
@@ -300,7 +508,58 @@ class HellaFusionController(QObject):
             if not global_stack:
                 self._logMessage("No active machine found.", is_error=True)
                 return
-
+            
+            # Switching back to a configuration seen before reuses its profile list
+            cache_key = self._profileCacheKey(global_stack)
+            cached_profiles = self._profile_cache.get(cache_key)
+            if cached_profiles is not None:
+                self._quality_profiles = cached_profiles
+                self._logMessage(f"Loaded {len(cached_profiles)} quality profiles for current configuration.")
+                self.qualityProfilesLoaded.emit(self._quality_profiles.copy())
+                return
+            
+            self._is_loading_profiles = True
+            profiles = self._scanQualityProfiles(global_stack)
+            if profiles is not None:
+                self._quality_profiles = profiles
+                
+                # Don't cache a scan that raced with a profile change
+                if not self._reload_pending:
+                    self._profile_cache[cache_key] = profiles
+                
+                # Emit signal with loaded profiles
+                self.qualityProfilesLoaded.emit(self._quality_profiles.copy())
+        
+        except Exception as e:
+            Logger.log("e", f"Error loading quality profiles: {e}")
+            self._logMessage("Failed to load quality profiles.", is_error=True)
+        
+        finally:
+            # Always reset the loading flag
+            self._is_loading_profiles = False
+            
+            # Containers changed while scanning (e.g. lazily loaded ones), so the result may be stale
+            if self._reload_pending:
+                self._reload_pending = False
+                self._loadQualityProfilesAsync()
+    
+    def _profileCacheKey(self, global_stack):
+        """Key identifying the machine configuration a profile list was loaded for."""
+        extruders = global_stack.extruderList
+        return (global_stack.definition.getId(),
+                tuple(extruder.variant.getName() for extruder in extruders),
+                tuple(extruder.material.getMetaDataEntry("base_file") for extruder in extruders),
+                tuple(extruder.isEnabled for extruder in extruders))
+    
+    def _scanQualityProfiles(self, global_stack):
+        """Scan available quality profiles using the proper Cura API (from AutoSlicer).
+        
+        Only reads containers and returns a new list, leaving self._quality_profiles
+        to the caller. Returns None if the scan failed.
+        """
+        try:
+            application = CuraApplication.getInstance()
+            
             machine_name = global_stack.definition.getName()
             machine_definition_id = global_stack.definition.getId()
             
@@ -308,32 +567,36 @@ class HellaFusionController(QObject):
             
             actual_machine_id = machine_definition_id
             if machine_definition_id == "fdmprinter":                
-                container_registry = application.getContainerRegistry()
-                all_machine_definitions = container_registry.findDefinitionContainers(type="machine")
-                
-                potential_matches = []
-                for definition in all_machine_definitions:
-                    def_id = definition.getId()
-                    def_name = definition.getName().lower()
+                # The definitions scan only depends on the machine name, so remember its result
+                if machine_name in self._machine_definition_matches:
+                    match = self._machine_definition_matches[machine_name]
+                else:
+                    container_registry = application.getContainerRegistry()
+                    all_machine_definitions = container_registry.findDefinitionContainers(type="machine")
                     
-                    machine_name_words = machine_name.lower().split()
-                    if any(word in def_name for word in machine_name_words if len(word) > 2):
-                        potential_matches.append((def_id, definition.getName()))
+                    # Only the first matching definition is used, so stop scanning once found
+                    machine_name_words = tuple(word for word in machine_name.lower().split() if len(word) > 2)
+                    match = None
+                    if machine_name_words:
+                        for definition in all_machine_definitions:
+                            def_name = definition.getName()
+                            def_name_lower = def_name.lower()
+                            if any(word in def_name_lower for word in machine_name_words):
+                                match = (definition.getId(), def_name)
+                                break
+                    self._machine_definition_matches[machine_name] = match
                 
-                if potential_matches:
-                    actual_machine_id = potential_matches[0][0]
-                    self._logMessage(f"Found specific machine definition: {potential_matches[0][1]} ({actual_machine_id})")
+                if match:
+                    actual_machine_id = match[0]
+                    self._logMessage(f"Found specific machine definition: {match[1]} ({actual_machine_id})")
             
             machine_definition_id = actual_machine_id
             
-            self._quality_profiles = []
+            profiles = []
             
             try:
-                container_tree = ContainerTree.getInstance()
                 machine_definition_id = global_stack.definition.getId()
                 
-                machine_node = container_tree.machines[machine_definition_id]
-                                
                 # Get current machine configuration
                 variant_names = [extruder.variant.getName() for extruder in global_stack.extruderList]
                 material_bases = [extruder.material.getMetaDataEntry("base_file") for extruder in global_stack.extruderList]
@@ -341,67 +604,82 @@ class HellaFusionController(QObject):
                 # Collect available quality_types for this machine/variant/material combination
                 available_quality_types = set()
                 
-                # Get the current variant and material nodes for the first extruder (or global)
-                current_variant = machine_node.variants.get(variant_names[0]) if variant_names else None
+                # Get the current variant and material nodes for the first extruder (or global),
+                # reusing the previous tree walk while the configuration is unchanged
+                material_node_key = (machine_definition_id,
+                                     variant_names[0] if variant_names else None,
+                                     material_bases[0] if material_bases else None)
+                if material_node_key == self._cached_material_node_key:
+                    current_variant, current_material = self._cached_material_nodes
+                else:
+                    machine_node = ContainerTree.getInstance().machines[machine_definition_id]
+                    current_variant = machine_node.variants.get(variant_names[0]) if variant_names else None
+                    current_material = None
+                    if current_variant and material_bases[0]:
+                        current_material = current_variant.materials.get(material_bases[0])
+                    self._cached_material_node_key = material_node_key
+                    self._cached_material_nodes = (current_variant, current_material)
+                
                 if current_variant and material_bases[0]:
-                    current_material = current_variant.materials.get(material_bases[0])
                     if current_material:
                         # Iterate through all quality nodes for this material to collect available quality_types
+                        bad_intents = []  # (intent_id, error), reported once after the scan
                         for quality_node in current_material.qualities.values():
                             available_quality_types.add(quality_node.quality_type)
                             
+                            # These depend only on the quality node, not on the intent
+                            try:
+                                base_container = quality_node.container
+                                quality_name = base_container.getName()
+                            except Exception as quality_error:
+                                Logger.log("w", f"Error reading quality {quality_node.container_id}: {quality_error}")
+                                continue
+                            quality_type = quality_node.quality_type
+                            
                             # Check if this quality node has intent profiles
                             if hasattr(quality_node, 'intents') and quality_node.intents:
+                                display_name = f"[M] {quality_name}"
+                                
                                 # Process each intent profile for this quality
-                                for intent_id, intent_node in quality_node.intents.items():                                    
+                                for intent_id, intent_node in quality_node.intents.items():
+                                    # Only loading the intent container can fail
                                     try:
                                         intent_container = intent_node.container
-                                        if not intent_container:
-                                            continue
-                                            
-                                        # Get intent metadata - handle empty_intent as default
-                                        if intent_id == "empty_intent":
-                                            intent_category = "default"
-                                        else:
-                                            intent_category = intent_node.intent_category
-                                        
-                                        # Get the quality name from the base quality container
-                                        quality_name = quality_node.container.getName()
-                                        quality_type = quality_node.quality_type
-
-                                        # Create a profile entry with the intent-specific information
-                                        profile_entry = {
-                                            'display_name': f"[M] {quality_name}",
-                                            'container': quality_node.container,
-                                            'intent': intent_category,
-                                            'quality_name': quality_name,
-                                            'quality_group': None,
-                                            'quality_type': quality_type,
-                                            'is_available': True,
-                                            'intent_container': intent_container
-                                        }
-                                        self._quality_profiles.append(profile_entry)
-                                        
                                     except Exception as intent_error:
-                                        Logger.log("w", f"Error processing intent {intent_id}: {intent_error}")
+                                        bad_intents.append((intent_id, intent_error))
+                                        continue
+                                    if not intent_container:
+                                        continue
+                                    
+                                    # Get intent metadata - handle empty_intent as default
+                                    if intent_id == "empty_intent":
+                                        intent_category = "default"
+                                    else:
+                                        intent_category = intent_node.intent_category
+
+                                    # Create a profile entry with the intent-specific information
+                                    profiles.append(QualityProfileEntry(
+                                        display_name=display_name,
+                                        container=base_container,
+                                        intent=intent_category,
+                                        quality_name=quality_name,
+                                        quality_type=quality_type,
+                                        intent_container=intent_container
+                                    ))
                             else:
                                 # No intents available, add the base quality profile with default intent
-                                try:
-                                    quality_name = quality_node.container.getName()
-                                    quality_type = quality_node.quality_type
-                                    
-                                    profile_entry = {
-                                        'display_name': quality_name,
-                                        'container': quality_node.container,
-                                        'intent': "default",
-                                        'quality_name': quality_name,
-                                        'quality_group': None,
-                                        'quality_type': quality_type,
-                                        'is_available': True
-                                    }
-                                    self._quality_profiles.append(profile_entry)
-                                except Exception as base_error:
-                                    Logger.log("w", f"Error adding base quality {quality_node.container_id}: {base_error}")
+                                profiles.append(QualityProfileEntry(
+                                    display_name=quality_name,
+                                    container=base_container,
+                                    intent="default",
+                                    quality_name=quality_name,
+                                    quality_type=quality_type
+                                ))
+                        
+                        if bad_intents:
+                            Logger.log("w", "Skipped %d intent profile(s) that failed to load: %s",
+                                       len(bad_intents),
+                                       "; ".join(f"{intent_id}: {error}" for intent_id, error in bad_intents))
                     else:
                         Logger.log("w", f"No material node found for base: {material_bases[0]}")
                 else:
@@ -413,130 +691,68 @@ class HellaFusionController(QObject):
             
             # Always scan for user-defined quality_changes profiles
             container_registry = application.getContainerRegistry()
-            all_quality_changes = container_registry.findInstanceContainers(type="quality_changes")
-            quality_changes_containers = []
             
             # Build compatibility list using inheritance chain
             compatible_definitions = self._buildCompatibleDefinitionsList(machine_definition_id, global_stack)
+            # Containers with an "unknown" definition are accepted as well
+            accepted_definitions = compatible_definitions | {"unknown"}
+            available_quality_types = frozenset(available_quality_types)
             
-            # Add quality_definition if different from machine_definition_id
-            current_definition = global_stack.definition
-            quality_definition = current_definition.getMetaDataEntry("quality_definition", machine_definition_id)
-            if quality_definition and quality_definition not in compatible_definitions:
-                compatible_definitions.append(quality_definition)
-                        
-            for qc_container in all_quality_changes:
-                try:
-                    qc_name = qc_container.getName()
-                    qc_definition = qc_container.getMetaDataEntry("definition", "unknown")
-                    qc_position = qc_container.getMetaDataEntry("position")
-                    qc_quality_type = qc_container.getMetaDataEntry("quality_type", "normal")
-                                        
-                    # Skip if this is an extruder-specific container (we want global ones)
-                    if qc_position is not None:
-                        continue
-                        
-                    # Enhanced compatibility check using expanded definition list
-                    is_compatible = False
-                    
-                    # Check if the quality_changes definition matches any compatible definition
-                    if qc_definition in compatible_definitions:
-                        is_compatible = True
-                    elif qc_definition == "unknown":
-                        is_compatible = True
-                    
-                    # Check if the quality_type is available for current nozzle/material combination
-                    if is_compatible and available_quality_types:
-                        if qc_quality_type not in available_quality_types:
-                            is_compatible = False
-                    
-                    if is_compatible:
-                        quality_changes_containers.append(qc_container)
-                        
-                except Exception as qc_error:
-                    Logger.log("w", f"Error checking quality_changes compatibility for {qc_container.getId()}: {qc_error}")
-                    continue
+            # Query per accepted definition so profiles of other machines are never visited;
+            # metadata queries don't load containers from disk, only matches get loaded
+            all_quality_changes = []
+            for definition_id in accepted_definitions:
+                all_quality_changes.extend(container_registry.findInstanceContainersMetadata(
+                    type="quality_changes", definition=definition_id))
             
-            # Process found user-defined quality changes
-            for quality_changes_container in quality_changes_containers:
-                try:
-                    quality_name = quality_changes_container.getName()
-                    intent_category = quality_changes_container.getMetaDataEntry("intent_category", "default")
-                    quality_type = quality_changes_container.getMetaDataEntry("quality_type", "normal")
-                    
-                    # Filter out unwanted profiles
-                    if quality_name.lower() in ["empty", "not_supported"] or intent_category == "Not_Supported":
-                        continue
-                    
-                    # Enhanced intent detection for quality changes
-                    if intent_category == "default" or not intent_category:
-                        alt_intent = quality_changes_container.getMetaDataEntry("intent", "")
-                        if alt_intent and alt_intent != "default":
-                            intent_category = alt_intent
-                        else:
-                            intent_category = "default"
-                                        
-                    # Create a profile entry for quality changes (user-defined)
-                    profile_entry = {
-                        'display_name': f"* {quality_name}",  # Star indicates user-defined
-                        'container': quality_changes_container,
-                        'intent': intent_category,
-                        'quality_name': quality_name,
-                        'quality_group': None,
-                        'quality_type': quality_type,
-                        'is_available': True,
-                        'is_user_defined': True
-                    }
-                    
-                    self._quality_profiles.append(profile_entry)
-                    
-                except Exception as profile_error:
-                    Logger.log("w", f"Error processing quality changes container {quality_changes_container.getId()}: {profile_error}")
-                    continue
+            # Filter and add user-defined quality changes in a single pass
+            build_entry = partial(self._buildQualityChangesEntry,
+                                  container_registry=container_registry,
+                                  accepted_definitions=accepted_definitions,
+                                  available_quality_types=available_quality_types)
+            machine_profiles_found = len(profiles)
+            profiles.extend(filter(None, map(build_entry, all_quality_changes)))
+            # User-defined entries only come from the quality_changes pass above
+            custom_profiles_count = len(profiles) - machine_profiles_found
             
             # Sort profiles by intent category, then quality name
-            self._quality_profiles.sort(key=lambda x: (x['intent'], x['quality_name']))
-            
-            # Ensure we have default profiles
-            has_default_intent = any(profile['intent'] == 'default' for profile in self._quality_profiles)
-            if not has_default_intent and self._quality_profiles:
-                # Group by quality type to create default profiles
-                quality_types = {}
-                for profile in self._quality_profiles:
-                    quality_type = profile['quality_type']
-                    if quality_type not in quality_types:
-                        quality_types[quality_type] = profile
-                
+            profiles.sort(key=attrgetter('intent', 'quality_name'))
+            
+            # Ensure we have default profiles. One pass looks for a default profile and,
+            # until one turns up, records the first (sorted) profile of each quality type
+            quality_types = {}
+            has_default_intent = False
+            for profile in profiles:
+                if profile.intent == 'default':
+                    has_default_intent = True
+                    break
+                quality_types.setdefault(profile.quality_type, profile)
+            
+            if not has_default_intent:
                 # Create default intent versions of each quality type
                 for quality_type, representative_profile in quality_types.items():
-                    default_profile = {
-                        'display_name': representative_profile['quality_name'],
-                        'container': representative_profile['container'],
-                        'intent': 'default',
-                        'quality_name': representative_profile['quality_name'],
-                        'quality_group': representative_profile['quality_group'],
-                        'quality_type': quality_type,
-                        'is_available': True
-                    }
-                    self._quality_profiles.append(default_profile)
+                    default_profile = QualityProfileEntry(
+                        display_name=representative_profile.quality_name,
+                        container=representative_profile.container,
+                        intent='default',
+                        quality_name=representative_profile.quality_name,
+                        quality_type=quality_type,
+                        quality_group=representative_profile.quality_group
+                    )
+                    profiles.append(default_profile)
             
             # Summary
-            base_profiles_count = len([p for p in self._quality_profiles if not p.get('is_user_defined', False)])
-            custom_profiles_count = len([p for p in self._quality_profiles if p.get('is_user_defined', False)])
-            self._logMessage(f"Loaded {len(self._quality_profiles)} quality profiles for current configuration.")
-            self._logMessage(f"  - {base_profiles_count} machine profiles")
-            self._logMessage(f"  - {custom_profiles_count} custom profiles")
-            
-            # Emit signal with loaded profiles
-            self.qualityProfilesLoaded.emit(self._quality_profiles.copy())
+            base_profiles_count = len(profiles) - custom_profiles_count
+            self._logMessages([f"Loaded {len(profiles)} quality profiles for current configuration.",
+                               f"  - {base_profiles_count} machine profiles",
+                               f"  - {custom_profiles_count} custom profiles"])
+            
+            return profiles
                     
         except Exception as main_error:
             Logger.log("e", f"Error loading quality profiles: {main_error}")
             self._logMessage("Failed to load quality profiles.", is_error=True)
-        
-        finally:
-            # Always reset the loading flag
-            self._is_loading_profiles = False
+            return None
 
     def calculateTransitionAdjustments(self, transitions, apply_shrinkage_compensation=True):
         """
@@ -558,6 +774,29 @@ class HellaFusionController(QObject):
             if not transitions:
                 return []
             
+            # Reject malformed sections before touching the Cura stack (no profile switches wasted)
+            for i, transition in enumerate(transitions):
+                if (not transition.get('profile_id')
+                        or transition.get('start_height') is None
+                        or 'end_height' not in transition
+                        or 'section_number' not in transition):
+                    section_num = transition.get('section_number', i + 1)
+                    Logger.log("e", f"Section {section_num} is missing its profile or heights")
+                    self._logMessage(f"Section {section_num}: missing profile or heights, cannot calculate adjustments", is_error=True)
+                    return []
+            
+            # Convert transitions to format expected by TransitionCalculator
+            sections_config = []
+            for transition in transitions:
+                sections_config.append({
+                    'section_number': transition['section_number'],
+                    'start_height': transition['start_height'],
+                    'end_height': transition['end_height'],
+                    'profile_id': transition['profile_id'],
+                    'intent_category': transition.get('intent_category'),
+                    'intent_container_id': transition.get('intent_container_id')
+                })
+            
             application = CuraApplication.getInstance()
             machine_manager = application.getMachineManager()
             global_stack = application.getGlobalContainerStack()
@@ -572,25 +811,19 @@ class HellaFusionController(QObject):
             original_quality_changes_id = active_machine.qualityChanges.getId() if active_machine else None
             original_intent_category = machine_manager.activeIntentCategory
             
-            # Convert transitions to format expected by TransitionCalculator
-            sections_config = []
-            for transition in transitions:
-                sections_config.append({
-                    'section_number': transition['section_number'],
-                    'start_height': transition['start_height'],
-                    'end_height': transition['end_height'],
-                    'profile_id': transition['profile_id'],
-                    'intent_category': transition.get('intent_category'),
-                    'intent_container_id': transition.get('intent_container_id')
-                })
-            
             # Log shrinkage compensation status
             self._logMessage(f"Material shrinkage compensation: {'ENABLED' if apply_shrinkage_compensation else 'DISABLED'}")
             
+            # Loaded profile entries by container ID, used to skip switches to the active profile
+            profiles_by_id = {profile.container.getId(): profile for profile in self._quality_profiles}
+            
             # Create profile reader callback that switches profiles and reads parameters
             def profile_reader(profile_id, intent_category, intent_container_id):
                 """Read profile parameters by switching to the profile."""
-                if not self._switchQualityProfile(profile_id, intent_category, intent_container_id):
+                profile_entry = profiles_by_id.get(profile_id)
+                if profile_entry is not None and self._isProfileActive(profile_entry, intent_category, intent_container_id, global_stack):
+                    Logger.log("d", "Profile %s is already active, reading without switching", profile_id)
+                elif not self._switchQualityProfile(profile_id, intent_category, intent_container_id):
                     Logger.log("e", f"Failed to switch to profile {profile_id}")
                     return None
                 
@@ -599,52 +832,58 @@ class HellaFusionController(QObject):
                 if not extruders:
                     return None
                 
+                # Bind the property getters once; each is used several times below
+                get_global_property = global_stack.getProperty
+                get_extruder_property = extruders[0].getProperty
+                
                 # Read raw values from Cura (these have shrinkage compensation already applied)
-                layer_height_raw = float(global_stack.getProperty("layer_height", "value") or 0.2)
-                initial_layer_height_raw = float(global_stack.getProperty("layer_height_0", "value") or 0.2)
-                shrinkage_factor = float(global_stack.getProperty("material_shrinkage_percentage_z", "value") or 100.0)
+                layer_height_raw = float(get_global_property("layer_height", "value") or 0.2)
+                initial_layer_height_raw = float(get_global_property("layer_height_0", "value") or 0.2)
+                shrinkage_factor = float(get_global_property("material_shrinkage_percentage_z", "value") or 100.0)
                 
                 # Convert from Cura format to actual values for plugin calculations
-                layer_height_actual = TransitionData.convert_from_cura(layer_height_raw, shrinkage_factor, apply_shrinkage_compensation)
-                initial_layer_height_actual = TransitionData.convert_from_cura(initial_layer_height_raw, shrinkage_factor, apply_shrinkage_compensation)
+                from_cura_scaler = TransitionData.make_from_cura_scaler(shrinkage_factor, apply_shrinkage_compensation)
+                layer_height_actual = layer_height_raw * from_cura_scaler
+                initial_layer_height_actual = initial_layer_height_raw * from_cura_scaler
                 
+                quality = global_stack.quality
                 return {
                     'layer_height': layer_height_actual,
                     'initial_layer_height': initial_layer_height_actual,
-                    'retraction_enabled': bool(extruders[0].getProperty("retraction_enable", "value")),
-                    'retraction_amount': float(extruders[0].getProperty("retraction_amount", "value") or 2.0),
-                    'retraction_speed': float(extruders[0].getProperty("retraction_retract_speed", "value") or 35.0),
-                    'prime_speed': float(extruders[0].getProperty("retraction_prime_speed", "value") or 30.0),
+                    'retraction_enabled': bool(get_extruder_property("retraction_enable", "value")),
+                    'retraction_amount': float(get_extruder_property("retraction_amount", "value") or 2.0),
+                    'retraction_speed': float(get_extruder_property("retraction_retract_speed", "value") or 35.0),
+                    'prime_speed': float(get_extruder_property("retraction_prime_speed", "value") or 30.0),
                     'material_shrinkage_percentage_z': shrinkage_factor,
-                    'profile_name': global_stack.quality.getName() if global_stack.quality else "Unknown"
+                    'profile_name': quality.getName() if quality else "Unknown"
                 }
 
-            self._logMessage("═" * 80)
-            self._logMessage("USING TRANSITIONCALCULATOR ")
-            self._logMessage("═" * 80)
+            banner = "═" * 80
+            self._logMessages([banner, "USING TRANSITIONCALCULATOR ", banner])
             
-            calculator = TransitionCalculator()
+            calculator = self._transition_calculator
             transition_data_list = calculator.calculate_all_transitions(sections_config, profile_reader)
             
-            # Log calculation results
+            # Log calculation results, batched into as few log signals as possible
+            lines = []
             for td in transition_data_list:
-                self._logMessage("")
-                self._logMessage(td.get_summary())
+                lines.append("")
+                lines.append(td.get_summary())
             
-            self._logMessage("")
+            lines.append("")
             
             # Check for validation errors
             if calculator.has_errors():
-                self._logMessage("═" * 80)
+                lines.append(banner)
+                self._logMessages(lines)
                 self._logMessage("⚠️  VALIDATION ERRORS DETECTED:", is_error=True)
-                self._logMessage("═" * 80)
-                for error in calculator.get_validation_errors():
-                    self._logMessage(f"  • {error}", is_error=True)
-                self._logMessage("")
+                self._logMessage(banner)
+                self._logMessages([f"  • {error}" for error in calculator.get_validation_errors()], is_error=True)
+                self._logMessages(["", banner])
             else:
-                self._logMessage("✅ All transition validations passed!")
-            
-            self._logMessage("═" * 80)
+                lines.append("✅ All transition validations passed!")
+                lines.append(banner)
+                self._logMessages(lines)
             
             # Convert TransitionData objects to backward-compatible dict format for Logic
             # This maintains compatibility with existing HellaFusionLogic.combineGcodeFiles()
@@ -683,6 +922,39 @@ class HellaFusionController(QObject):
             self._logMessage(f"Failed to calculate adjustments: {e}", is_error=True)
             return []
 
+    def _isProfileActive(self, profile_entry, intent_category, intent_container_id, global_stack) -> bool:
+        """Check whether the global stack already resolves settings from this profile and intent.
+        
+        Only the containers' identity is compared; a switch would produce the same
+        stack, so reading settings from the active stack gives identical values.
+        Built-in entries also require that no custom profile is layered on top.
+        """
+        try:
+            machine_manager = CuraApplication.getInstance().getMachineManager()
+            active_intent = machine_manager.activeIntentCategory or "default"
+            if (intent_category or "default").lower() != active_intent.lower():
+                return False
+            
+            if intent_container_id:
+                extruders = global_stack.extruderList
+                active_intent_id = extruders[0].intent.getId() if extruders else "empty_intent"
+                if active_intent_id != intent_container_id:
+                    return False
+            
+            quality_changes = global_stack.qualityChanges
+            has_quality_changes = quality_changes is not None and quality_changes.getId() != "empty_quality_changes"
+            
+            if profile_entry.is_user_defined:
+                return has_quality_changes and quality_changes.getId() == profile_entry.container.getId()
+            
+            quality = global_stack.quality
+            return (not has_quality_changes
+                    and quality is not None
+                    and quality.getMetaDataEntry("quality_type") == profile_entry.quality_type)
+        except Exception as e:
+            Logger.log("w", f"Could not compare active profile: {e}")
+            return False
+
     def _switchQualityProfile(self, profile_id: str, intent_category: str = None, intent_container_id: str = None) -> bool:
         """Switch to the specified quality profile using the centralized service."""
         try:
@@ -797,7 +1069,7 @@ class HellaFusionController(QObject):
                 return []
             
             # Validate using the validator service
-            issues = self._validator_service.validate_profile_settings(settings)
+            issues = self._validator_service.validate_profile_settings(settings, settings.keys())
             
             # Log validation results
             if issues:
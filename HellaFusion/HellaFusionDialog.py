@@ -774,7 +774,7 @@ class HellaFusionDialog(QDialog):
         try:
             # Trigger quality profiles reload through controller
             self._logMessage("Updating quality profiles from current Cura settings...")
-            self._controller._loadQualityProfilesAsync()
+            self._controller._loadQualityProfilesAsync(force=True)
             
             # Give the async operation a moment to complete, then update
             QTimer.singleShot(500, self._finishProfileUpdate)
@@ -962,7 +962,7 @@ class HellaFusionDialog(QDialog):
         # Group profiles by intent
         intent_groups = {}
         for profile_entry in self._quality_profiles:
-            intent = profile_entry['intent']
+            intent = profile_entry.intent
             intent_display = self._controller.normalizeIntentName(intent)
             if intent_display not in intent_groups:
                 intent_groups[intent_display] = []
@@ -981,15 +981,15 @@ class HellaFusionDialog(QDialog):
             item_index += 1
             
             # Add profiles
-            for profile_entry in sorted(profiles, key=lambda p: p['quality_name']):
-                quality_name = profile_entry['quality_name']
-                container = profile_entry['container']
+            for profile_entry in sorted(profiles, key=lambda p: p.quality_name):
+                quality_name = profile_entry.quality_name
+                container = profile_entry.container
                 
                 if not container:
                     continue
                 
                 # Display format: "Quality Name - Intent" (with * for user-defined)
-                if profile_entry.get('is_user_defined', False):
+                if profile_entry.is_user_defined:
                     display_text = f"  * {quality_name} - {intent_display}"
                 else:
                     display_text = f"  {quality_name} - {intent_display}"
@@ -997,12 +997,12 @@ class HellaFusionDialog(QDialog):
                 container_id = container.getId()
                 profile_data = {
                     'container_id': container_id,
-                    'intent_category': profile_entry['intent'],
-                    'intent_container_id': profile_entry.get('intent_container').getId() if profile_entry.get('intent_container') else None,
+                    'intent_category': profile_entry.intent,
+                    'intent_container_id': profile_entry.intent_container.getId() if profile_entry.intent_container else None,
                     'quality_name': quality_name,
                     'intent_display': intent_display,
-                    'quality_type': profile_entry.get('quality_type'),
-                    'is_user_defined': profile_entry.get('is_user_defined', False)
+                    'quality_type': profile_entry.quality_type,
+                    'is_user_defined': profile_entry.is_user_defined
                 }
                 combo_box.addItem(display_text, profile_data)
                 item_index += 1
@@ -1356,13 +1356,18 @@ class HellaFusionDialog(QDialog):
             self._progress_bar.setValue(0)
     
     def _logMessage(self, message, is_error=False):
-        """Add a message to the log."""
+        """Add a message to the log.
+        
+        Multi-line messages (batched by the controller) are formatted line by line
+        and appended to the log in one go.
+        """
         if is_error:
-            formatted_message = f'<span style="color: {PluginConstants.ERROR_TEXT_COLOR_LIGHT_RED};">ERROR: {message}</span>'
+            line_format = f'<span style="color: {PluginConstants.ERROR_TEXT_COLOR_LIGHT_RED};">ERROR: {{}}</span>'
             Logger.log("e", message)
         else:
-            formatted_message = f'<span style="color: {PluginConstants.TEXT_COLOR_LIGHT_GRAY};">{message}</span>'
-            
+            line_format = f'<span style="color: {PluginConstants.TEXT_COLOR_LIGHT_GRAY};">{{}}</span>'
+        
+        formatted_message = "<br>".join(line_format.format(line) for line in message.split("\n"))
         self._log_text.append(formatted_message)
         
         # Auto-scroll to bottom
@@ -2083,4 +2088,7 @@ class HellaFusionDialog(QDialog):
                 event.ignore()
                 return
         
+        # Don't leave a debounced settings write pending
+        self._controller.flushSettings()
+        
         super().closeEvent(event)
@@ -106,8 +106,9 @@ class HellaFusionLogic:
                     # Convert from Cura format to actual values for plugin calculations
                     # Handle potential import timing issues during module initialization
                     try:
-                        self._layer_height = TransitionData.convert_from_cura(layer_height_raw, self._shrinkage_compensation_factor)
-                        self._initial_layer_height = TransitionData.convert_from_cura(initial_layer_height_raw, self._shrinkage_compensation_factor)
+                        from_cura_scaler = TransitionData.make_from_cura_scaler(self._shrinkage_compensation_factor)
+                        self._layer_height = layer_height_raw * from_cura_scaler
+                        self._initial_layer_height = initial_layer_height_raw * from_cura_scaler
                     except AttributeError:
                         self._layer_height = layer_height_raw
                         self._initial_layer_height = initial_layer_height_raw
@@ -14,13 +14,35 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import weakref
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from UM.Logger import Logger
 from cura.CuraApplication import CuraApplication
 from cura.Machines.ContainerTree import ContainerTree
 
 
+# Setting keys checked by the built-in rules
+_SUPPORT_ENABLE = "support_enable"
+_SUPPORT_STRUCTURE = "support_structure"
+_ADHESION_TYPE = "adhesion_type"
+_PRINT_SEQUENCE = "print_sequence"
+_ADAPTIVE_LAYERS = "adaptive_layer_height_enabled"
+
+# Setting values that trigger the built-in rules
+_TREE = "tree"
+_RAFT = "raft"
+_ONE_AT_A_TIME = "one_at_a_time"
+
+# Spellings of "true" that Cura commonly returns for boolean settings
+_TRUE_STRINGS = frozenset(("true", "True", "TRUE"))
+
+
+def _is_truthy(value: Any) -> bool:
+    """Check if a boolean setting is enabled. Cura may return boolean True or string "true" depending on the source."""
+    return value is True or (isinstance(value, str) and (value in _TRUE_STRINGS or value.lower() == "true"))
+
+
 class ValidationSeverity(Enum):
     """Severity levels for profile validation issues."""
     WARNING = "warning"
@@ -30,6 +52,8 @@ class ValidationSeverity(Enum):
 class ValidationIssue:
     """Represents a validation issue found in a profile."""
     
+    __slots__ = ('setting_key', 'severity', 'message', 'found_value', 'rule_id')
+    
     def __init__(self, setting_key: str, severity: ValidationSeverity, message: str, 
                  found_value: Any = None, rule_id: str = None):
         self.setting_key = setting_key
@@ -43,18 +67,20 @@ class ValidationIssue:
     
     def is_error(self) -> bool:
         """Check if this is an error-level issue."""
-        return self.severity == ValidationSeverity.ERROR
+        return self.severity is ValidationSeverity.ERROR
     
     def is_warning(self) -> bool:
         """Check if this is a warning-level issue."""
-        return self.severity == ValidationSeverity.WARNING
+        return self.severity is ValidationSeverity.WARNING
 
 
 class ValidationRule:
     """Defines a validation rule for checking profile settings."""
     
+    __slots__ = ('rule_id', 'setting_key', 'severity', 'message', 'check_function', 'requires_settings')
+    
     def __init__(self, rule_id: str, setting_key: str, severity: ValidationSeverity,
-                 message: str, check_function: callable, requires_settings: List[str] = None):
+                 message: str, check_function: callable = None, requires_settings: List[str] = None):
         """
         Initialize a validation rule.
         
@@ -63,7 +89,8 @@ class ValidationRule:
             setting_key: The Cura setting key to check (e.g., 'support_enable')
             severity: ValidationSeverity.WARNING or ValidationSeverity.ERROR
             message: User-friendly message to display when rule is triggered
-            check_function: Function that takes (setting_value, all_settings) and returns True if issue exists
+            check_function: Function that takes (setting_value, all_settings) and returns True if issue exists.
+                Subclasses that override _check() do not need one.
             requires_settings: Optional list of additional setting keys needed for validation
         """
         self.rule_id = rule_id
@@ -73,6 +100,10 @@ class ValidationRule:
         self.check_function = check_function
         self.requires_settings = requires_settings or []
     
+    def _check(self, setting_value: Any, all_settings: Dict[str, Any]) -> bool:
+        """Return True if the rule is triggered. Subclasses override this for common checks."""
+        return self.check_function(setting_value, all_settings)
+    
     def validate(self, setting_value: Any, all_settings: Dict[str, Any] = None) -> Optional[ValidationIssue]:
         """
         Validate a setting value against this rule.
@@ -86,7 +117,7 @@ class ValidationRule:
         """
         try:
             # Pass both the specific value and all settings for context-aware validation
-            result = self.check_function(setting_value, all_settings or {})
+            result = self._check(setting_value, all_settings or {})
             
             if result:
                 return ValidationIssue(
@@ -97,11 +128,34 @@ class ValidationRule:
                     rule_id=self.rule_id
                 )
         except Exception as e:
-            Logger.log("w", f"Error checking validation rule {self.rule_id}: {e}")
+            Logger.log("w", "Error checking validation rule %s: %s", self.rule_id, e)
         
         return None
 
 
+class EqualsRule(ValidationRule):
+    """Validation rule that triggers when the setting equals an expected value."""
+    
+    __slots__ = ('expected_value',)
+    
+    def __init__(self, rule_id: str, setting_key: str, severity: ValidationSeverity,
+                 message: str, expected_value: Any, requires_settings: List[str] = None):
+        super().__init__(rule_id, setting_key, severity, message, requires_settings=requires_settings)
+        self.expected_value = expected_value
+    
+    def _check(self, setting_value: Any, all_settings: Dict[str, Any]) -> bool:
+        return setting_value == self.expected_value
+
+
+class BoolTrueRule(ValidationRule):
+    """Validation rule that triggers when a boolean setting is enabled."""
+    
+    __slots__ = ()
+    
+    def _check(self, setting_value: Any, all_settings: Dict[str, Any]) -> bool:
+        return _is_truthy(setting_value)
+
+
 class ProfileValidatorService:
     """
     Service for validating Cura profile settings against HellaFusion compatibility rules.
@@ -113,15 +167,58 @@ class ProfileValidatorService:
     def __init__(self):
         """Initialize the validator with predefined rules."""
         self._rules = self._initialize_validation_rules()
+        self._rules_by_key: Dict[str, List[ValidationRule]] = {}
+        self._required_settings: Tuple[str, ...] = ()
+        self._index_rules()
+        self._read_cache: Dict[tuple, Dict[str, Any]] = {}
+        # id(container) -> container whose propertyChanged invalidates _read_cache
+        self._watched_containers = weakref.WeakValueDictionary()
+        
+        # Cura singletons, resolved on first use
+        self._application = None
+        self._container_registry = None
+        self._container_tree = None
+    
+    @property
+    def application(self):
+        """The Cura application instance (cached after first access)."""
+        if self._application is None:
+            self._application = CuraApplication.getInstance()
+        return self._application
+    
+    @property
+    def container_registry(self):
+        """The Cura container registry (cached after first access)."""
+        if self._container_registry is None:
+            self._container_registry = self.application.getContainerRegistry()
+        return self._container_registry
+    
+    @property
+    def container_tree(self):
+        """The Cura ContainerTree instance (cached after first access)."""
+        if self._container_tree is None:
+            self._container_tree = ContainerTree.getInstance()
+        return self._container_tree
     
-    def get_required_settings(self) -> List[str]:
+    def get_required_settings(self) -> Tuple[str, ...]:
         """
-        Get the list of setting keys that need to be read for validation.
+        Get the setting keys that need to be read for validation.
+        
+        The keys are computed once from the registered rules and only rebuilt
+        when a custom rule is added.
         
         Returns:
-            List of Cura setting keys required by all validation rules
+            Tuple of Cura setting keys required by all validation rules
         """
-        return [rule.setting_key for rule in self._rules]
+        return self._required_settings
+    
+    def _index_rules(self):
+        """Group the registered rules by setting key and derive the required settings from them."""
+        rules_by_key = {}
+        for rule in self._rules:
+            rules_by_key.setdefault(rule.setting_key, []).append(rule)
+        self._rules_by_key = rules_by_key
+        self._required_settings = tuple(rules_by_key)
     
     def _initialize_validation_rules(self) -> List[ValidationRule]:
         """
@@ -133,79 +230,83 @@ class ProfileValidatorService:
         rules = []
         
         # Rule 1: Support enabled (Warning)
-        rules.append(ValidationRule(
+        rules.append(BoolTrueRule(
             rule_id="support_enabled",
-            setting_key="support_enable",
+            setting_key=_SUPPORT_ENABLE,
             severity=ValidationSeverity.WARNING,
-            message="Support is enabled. This may cause issues with HellaFusion transitions.",
-            check_function=lambda value, all_settings: value is True or (isinstance(value, str) and value.lower() == "true")
+            message="Support is enabled. This may cause issues with HellaFusion transitions."
         ))
         
         # Rule 2: Tree support structure (Error)
         # Only triggers if support is actually enabled
         rules.append(ValidationRule(
             rule_id="tree_support",
-            setting_key="support_structure",
+            setting_key=_SUPPORT_STRUCTURE,
             severity=ValidationSeverity.ERROR,
             message="Tree support structure is enabled. This is not compatible with HellaFusion and must be changed or overridden.",
-            check_function=lambda value, all_settings: (
-                value == "tree" and 
-                (all_settings.get('support_enable') is True or 
-                 (isinstance(all_settings.get('support_enable'), str) and all_settings.get('support_enable').lower() == "true"))
-            ),
-            requires_settings=["support_enable"]
+            check_function=lambda value, all_settings: value == _TREE and _is_truthy(all_settings.get(_SUPPORT_ENABLE)),
+            requires_settings=[_SUPPORT_ENABLE]
         ))
         
         # Rule 3: Raft adhesion (Warning)
-        rules.append(ValidationRule(
+        rules.append(EqualsRule(
             rule_id="raft_adhesion",
-            setting_key="adhesion_type",
+            setting_key=_ADHESION_TYPE,
             severity=ValidationSeverity.WARNING,
             message="Raft bed adhesion is enabled. This may affect transition height calculations.",
-            check_function=lambda value, all_settings: value == "raft"
+            expected_value=_RAFT
         ))
         
         # Rule 4: One at a time print sequence (Error)
-        rules.append(ValidationRule(
+        rules.append(EqualsRule(
             rule_id="one_at_a_time",
-            setting_key="print_sequence",
+            setting_key=_PRINT_SEQUENCE,
             severity=ValidationSeverity.ERROR,
             message="'One at a Time' print sequence is enabled. This is not compatible with HellaFusion and must be changed or overridden.",
-            check_function=lambda value, all_settings: value == "one_at_a_time"
+            expected_value=_ONE_AT_A_TIME
         ))
         
         # Rule 5: Adaptive layers (Warning)
-        # Note: Cura may return boolean True or string "true" depending on the source
-        rules.append(ValidationRule(
+        rules.append(BoolTrueRule(
             rule_id="adaptive_layers",
-            setting_key="adaptive_layer_height_enabled",
+            setting_key=_ADAPTIVE_LAYERS,
             severity=ValidationSeverity.WARNING,
-            message="Adaptive layers are enabled. This may interfere with HellaFusion's layer height calculations.",
-            check_function=lambda value, all_settings: value is True or (isinstance(value, str) and value.lower() == "true")
+            message="Adaptive layers are enabled. This may interfere with HellaFusion's layer height calculations."
         ))
         
         return rules
     
-    def validate_profile_settings(self, profile_settings: Dict[str, Any]) -> List[ValidationIssue]:
+    def validate_profile_settings(self, profile_settings: Dict[str, Any], present_keys=None) -> List[ValidationIssue]:
         """
         Validate a profile's settings against all rules.
         
         Args:
             profile_settings: Dictionary of setting_key -> setting_value pairs
+            present_keys: Optional set-like view of the keys found in the profile
+                (defaults to profile_settings.keys())
             
         Returns:
             List of ValidationIssue objects (empty if no issues found)
         """
         issues = []
+        add_issue = issues.append  # Bound once; there is at most one issue per rule
         
-        for rule in self._rules:
+        # Nothing to do if the profile has none of the settings the rules check
+        if present_keys is None:
+            present_keys = profile_settings.keys()
+        if present_keys.isdisjoint(self._rules_by_key):
+            return issues
+        
+        for setting_key, rules in self._rules_by_key.items():
             # Check if the setting exists in the profile
-            if rule.setting_key in profile_settings:
-                setting_value = profile_settings[rule.setting_key]
+            if setting_key not in present_keys:
+                continue
+            setting_value = profile_settings[setting_key]
+            for rule in rules:
                 # Pass all settings for context-aware validation
                 issue = rule.validate(setting_value, profile_settings)
                 if issue:
-                    issues.append(issue)
+                    add_issue(issue)
         
         return issues
     
@@ -219,7 +320,7 @@ class ProfileValidatorService:
         Returns:
             True if any error-level issues exist
         """
-        return any(issue.is_error() for issue in issues)
+        return any(issue.severity is ValidationSeverity.ERROR for issue in issues)
     
     def has_warnings(self, issues: List[ValidationIssue]) -> bool:
         """
@@ -231,7 +332,7 @@ class ProfileValidatorService:
         Returns:
             True if any warning-level issues exist
         """
-        return any(issue.is_warning() for issue in issues)
+        return any(issue.severity is ValidationSeverity.WARNING for issue in issues)
     
     def get_errors(self, issues: List[ValidationIssue]) -> List[ValidationIssue]:
         """
@@ -243,7 +344,8 @@ class ProfileValidatorService:
         Returns:
             List of error-level issues only
         """
-        return [issue for issue in issues if issue.is_error()]
+        error = ValidationSeverity.ERROR
+        return [issue for issue in issues if issue.severity is error]
     
     def get_warnings(self, issues: List[ValidationIssue]) -> List[ValidationIssue]:
         """
@@ -255,7 +357,8 @@ class ProfileValidatorService:
         Returns:
             List of warning-level issues only
         """
-        return [issue for issue in issues if issue.is_warning()]
+        warning = ValidationSeverity.WARNING
+        return [issue for issue in issues if issue.severity is warning]
     
     def add_custom_rule(self, rule: ValidationRule):
         """
@@ -267,6 +370,8 @@ class ProfileValidatorService:
             rule: ValidationRule object to add
         """
         self._rules.append(rule)
+        self._index_rules()
+        self.invalidate_cache()
     
     def get_all_rules(self) -> List[ValidationRule]:
         """
@@ -277,6 +382,109 @@ class ProfileValidatorService:
         """
         return self._rules.copy()
     
+    def invalidate_cache(self):
+        """
+        Drop all memoized profile reads.
+        
+        Must be called whenever the machine, its extruder configuration or any
+        profile container changes, since cached values would otherwise be stale.
+        Setting value changes in containers that were read are picked up
+        automatically (see _watch_containers).
+        """
+        self._read_cache.clear()
+    
+    def _watch_containers(self, containers):
+        """
+        Invalidate the read cache when a setting value changes in any of the given containers.
+        
+        Editing a profile (e.g. "Update profile with current settings") keeps its ID and
+        metadata, so the cache key alone cannot notice the new values.
+        
+        Args:
+            containers: Containers a cached read was built from
+        """
+        for container in containers:
+            if self._watched_containers.get(id(container)) is container:
+                continue
+            property_changed = getattr(container, "propertyChanged", None)
+            if property_changed is None:
+                continue
+            property_changed.connect(self._on_container_property_changed)
+            self._watched_containers[id(container)] = container
+    
+    def _on_container_property_changed(self, key: str, property_name: str):
+        """Drop memoized profile reads when a setting value changes in a watched container."""
+        if property_name == "value":
+            self._read_cache.clear()
+    
+    def _make_cache_key(self, container_id: str, intent_container_id: Optional[str], global_stack, extruder_stacks) -> tuple:
+        """
+        Build the memoization key for a profile read.
+        
+        Args:
+            container_id: ID of the quality or quality_changes container
+            intent_container_id: ID of the intent container (may be None)
+            global_stack: The active global container stack
+            extruder_stacks: The extruder stacks of the global stack
+            
+        Returns:
+            Hashable tuple identifying the profile and the active extruder configuration
+        """
+        variant_names = tuple(extruder.variant.getName() for extruder in extruder_stacks)
+        material_bases = tuple(extruder.material.getMetaDataEntry("base_file") for extruder in extruder_stacks)
+        extruder_enabled = tuple(extruder.isEnabled for extruder in extruder_stacks)
+        return (container_id, intent_container_id, global_stack.getId(), variant_names, material_bases, extruder_enabled)
+    
+    def _resolve_quality_containers(self, quality_type: Optional[str], machine_definition: Optional[str],
+                                    extruder_stacks) -> Tuple[Any, Any]:
+        """
+        Find the global and first-extruder quality containers for a profile via the ContainerTree.
+        
+        Args:
+            quality_type: The profile's quality_type metadata
+            machine_definition: The profile's definition metadata
+            extruder_stacks: Extruder stacks of the active machine
+            
+        Returns:
+            Tuple of (global_quality_container, extruder_quality_container), either may be None
+        """
+        global_quality_container = None
+        extruder_quality_container = None
+        
+        if not quality_type or not machine_definition:
+            return global_quality_container, extruder_quality_container
+        
+        machine_node = self.container_tree.machines.get(machine_definition)
+        if not machine_node:
+            return global_quality_container, extruder_quality_container
+        
+        # Get quality groups for the current extruder configuration
+        variant_names = []
+        material_bases = []
+        extruder_enabled = []
+        for extruder in extruder_stacks:
+            variant_names.append(extruder.variant.getName())
+            material_bases.append(extruder.material.getMetaDataEntry("base_file"))
+            extruder_enabled.append(extruder.isEnabled)
+        
+        quality_groups = machine_node.getQualityGroups(variant_names, material_bases, extruder_enabled)
+        
+        # Get the quality group for this quality type
+        quality_group = quality_groups.get(quality_type)
+        if quality_group is None:
+            return global_quality_container, extruder_quality_container
+        
+        # Get the global quality node
+        if quality_group.node_for_global and quality_group.node_for_global.container:
+            global_quality_container = quality_group.node_for_global.container
+        
+        # Get the extruder quality node for the first extruder (position 0)
+        quality_node = quality_group.nodes_for_extruders.get(0)
+        if quality_node and quality_node.container:
+            extruder_quality_container = quality_node.container
+        
+        return global_quality_container, extruder_quality_container
+    
     def read_profile_settings(self, profile_data: dict) -> dict:
         """
         Read setting values from a profile by querying the container hierarchy.
@@ -299,9 +507,8 @@ class ProfileValidatorService:
                 return settings
             
             # Get the application and current stack
-            application = CuraApplication.getInstance()
-            global_stack = application.getGlobalContainerStack()
-            container_registry = application.getContainerRegistry()
+            global_stack = self.application.getGlobalContainerStack()
+            container_registry = self.container_registry
             
             if not global_stack:
                 return settings
@@ -310,6 +517,12 @@ class ProfileValidatorService:
             if not extruder_stacks:
                 return settings
             
+            # Reuse a previous read if nothing relevant has changed since
+            cache_key = self._make_cache_key(container_id, intent_container_id, global_stack, extruder_stacks)
+            cached_settings = self._read_cache.get(cache_key)
+            if cached_settings is not None:
+                return cached_settings.copy()
+            
             extruder_stack = extruder_stacks[0]
             
             # Find the profile container (could be quality or quality_changes)
@@ -318,78 +531,23 @@ class ProfileValidatorService:
                 return settings
             
             profile_container = profile_containers[0]
-            container_type = profile_container.getMetaDataEntry("type", "quality")
+            # Read the metadata once rather than entry by entry
+            metadata = profile_container.getMetaData()
+            container_type = metadata.get("type", "quality")
             
             # Determine which containers have the quality settings
             # Quality profiles have TWO containers: global and extruder-specific
             global_quality_container = None
             extruder_quality_container = None
             
-            if container_type == "quality":
-                # For regular quality profiles, use ContainerTree to get the quality group
-                extruder_quality_container = profile_container
-                
-                quality_type = profile_container.getMetaDataEntry("quality_type")
-                machine_definition = profile_container.getMetaDataEntry("definition")
-                
-                if quality_type and machine_definition:
-                    # Use ContainerTree to get the quality group
-                    container_tree = ContainerTree.getInstance()
-                    machine_node = container_tree.machines.get(machine_definition)
-                    
-                    if machine_node:
-                        # Get quality groups for the current extruder configuration
-                        variant_names = [extruder.variant.getName() for extruder in global_stack.extruderList]
-                        material_bases = [extruder.material.getMetaDataEntry("base_file") for extruder in global_stack.extruderList]
-                        extruder_enabled = [extruder.isEnabled for extruder in global_stack.extruderList]
-                        
-                        quality_groups = machine_node.getQualityGroups(variant_names, material_bases, extruder_enabled)
-                        
-                        # Get the quality group for this quality type
-                        if quality_type in quality_groups:
-                            quality_group = quality_groups[quality_type]
-                            
-                            # Get the global quality node
-                            if quality_group.node_for_global and quality_group.node_for_global.container:
-                                global_quality_container = quality_group.node_for_global.container
-                            
-                            # Get the extruder quality node for the first extruder (position 0)
-                            if 0 in quality_group.nodes_for_extruders:
-                                quality_node = quality_group.nodes_for_extruders[0]
-                                if quality_node and quality_node.container:
-                                    extruder_quality_container = quality_node.container
-            
-            elif container_type == "quality_changes":
-                # For quality_changes, use ContainerTree to find the correct base quality
-                quality_type = profile_container.getMetaDataEntry("quality_type")
-                machine_definition = profile_container.getMetaDataEntry("definition")
+            if container_type in ("quality", "quality_changes"):
+                # Use ContainerTree to find the quality group (for quality_changes, its base quality)
+                global_quality_container, extruder_quality_container = self._resolve_quality_containers(
+                    metadata.get("quality_type"), metadata.get("definition"), extruder_stacks)
                 
-                if quality_type and machine_definition:
-                    # Use ContainerTree to get the quality groups for this machine
-                    container_tree = ContainerTree.getInstance()
-                    machine_node = container_tree.machines.get(machine_definition)
-                    
-                    if machine_node:
-                        # Get quality groups for the current extruder configuration
-                        variant_names = [extruder.variant.getName() for extruder in extruder_stack.getNextStack().extruderList]
-                        material_bases = [extruder.material.getMetaDataEntry("base_file") for extruder in extruder_stack.getNextStack().extruderList]
-                        extruder_enabled = [extruder.isEnabled for extruder in extruder_stack.getNextStack().extruderList]
-                        
-                        quality_groups = machine_node.getQualityGroups(variant_names, material_bases, extruder_enabled)
-                        
-                        # Get the quality group for this quality type
-                        if quality_type in quality_groups:
-                            quality_group = quality_groups[quality_type]
-                            
-                            # Get the global quality node
-                            if quality_group.node_for_global and quality_group.node_for_global.container:
-                                global_quality_container = quality_group.node_for_global.container
-                            
-                            # Get the extruder quality node for the first extruder (position 0)
-                            if 0 in quality_group.nodes_for_extruders:
-                                quality_node = quality_group.nodes_for_extruders[0]
-                                if quality_node and quality_node.container:
-                                    extruder_quality_container = quality_node.container
+                if container_type == "quality" and extruder_quality_container is None:
+                    # Fall back to the selected quality container itself
+                    extruder_quality_container = profile_container
             
             # Find the intent container if specified
             intent_container = None
@@ -398,63 +556,40 @@ class ProfileValidatorService:
                 if intent_containers:
                     intent_container = intent_containers[0]
             
-            # Get setting keys we need to validate
-            setting_keys = self.get_required_settings()
+            # Build the container hierarchy once, in priority order:
+            # Intent -> Quality_changes -> Global_Quality -> Extruder_Quality -> Material -> Variant -> DefinitionChanges -> Definition
+            containers = tuple(container for container in (
+                intent_container,
+                profile_container if container_type == "quality_changes" else None,
+                global_quality_container,  # Has settings like adaptive_layer_height_enabled
+                extruder_quality_container,  # Has extruder-specific quality settings
+                extruder_stack.material,
+                extruder_stack.variant,
+                extruder_stack.definitionChanges,
+                extruder_stack.definition
+            ) if container)
             
-            # For each setting, search through the container hierarchy
-            # Container priority: Intent -> Quality_changes -> Global_Quality -> Extruder_Quality -> Material -> Variant -> DefinitionChanges -> Definition
-            for setting_key in setting_keys:
-                try:
-                    value = None
-                    
-                    # Check intent container
-                    if intent_container and intent_container.hasProperty(setting_key, "value"):
-                        value = intent_container.getProperty(setting_key, "value")
-                    
-                    # Check quality_changes container (user's modified settings)
-                    if value is None and container_type == "quality_changes" and profile_container.hasProperty(setting_key, "value"):
-                        value = profile_container.getProperty(setting_key, "value")
-                    
-                    # Check global quality container (has settings like adaptive_layer_height_enabled)
-                    if value is None and global_quality_container and global_quality_container.hasProperty(setting_key, "value"):
-                        value = global_quality_container.getProperty(setting_key, "value")
-                    
-                    # Check extruder quality container (has extruder-specific quality settings)
-                    if value is None and extruder_quality_container and extruder_quality_container.hasProperty(setting_key, "value"):
-                        value = extruder_quality_container.getProperty(setting_key, "value")
-                    
-                    # Check material (from current stack)
-                    if value is None:
-                        material = extruder_stack.material
-                        if material and material.hasProperty(setting_key, "value"):
-                            value = material.getProperty(setting_key, "value")
-                    
-                    # Check variant (from current stack)
-                    if value is None:
-                        variant = extruder_stack.variant
-                        if variant and variant.hasProperty(setting_key, "value"):
-                            value = variant.getProperty(setting_key, "value")
-                    
-                    # Check definition changes (from current stack)
-                    if value is None:
-                        def_changes = extruder_stack.definitionChanges
-                        if def_changes and def_changes.hasProperty(setting_key, "value"):
-                            value = def_changes.getProperty(setting_key, "value")
-                    
-                    # Check definition (from current stack)
-                    if value is None:
-                        definition = extruder_stack.definition
-                        if definition and definition.hasProperty(setting_key, "value"):
-                            value = definition.getProperty(setting_key, "value")
-                    
+            # For each setting, take the value from the first container that defines it
+            for setting_key in self._required_settings:
+                value = None
+                for container in containers:
+                    if not container.hasProperty(setting_key, "value"):
+                        continue
+                    # getProperty can raise (e.g. on a broken setting function); skip just that setting
+                    try:
+                        value = container.getProperty(setting_key, "value")
+                    except Exception as e:
+                        Logger.log("w", "Could not read setting %s: %s", setting_key, e)
+                        break
                     if value is not None:
-                        settings[setting_key] = value
-                        
-                except Exception as e:
-                    Logger.log("w", f"Could not read setting {setting_key}: {e}")
+                        break
+                if value is not None:
+                    settings[setting_key] = value
             
+            self._watch_containers(containers)
+            self._read_cache[cache_key] = settings.copy()
             return settings
             
         except Exception as e:
-            Logger.log("e", f"Error reading profile settings: {e}")
+            Logger.log("e", "Error reading profile settings: %s", e)
             return settings
@@ -0,0 +1,31 @@
+# HellaFusion Plugin for Cura
+# Based on work by GregValiant (Greg Foresi) and HellAholic
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class QualityProfileEntry:
+    """
+    A selectable quality profile loaded for the current machine configuration.
+
+    Machine profiles are one entry per quality/intent combination; user-defined
+    (quality_changes) profiles have is_user_defined set. Entries are immutable,
+    so the cached per-configuration profile lists can be shared safely.
+    """
+
+    display_name: str
+    container: Any  # quality or quality_changes InstanceContainer
+    intent: str
+    quality_name: str
+    quality_type: str
+    quality_group: Any = None
+    is_available: bool = True
+    intent_container: Optional[Any] = None
+    is_user_defined: bool = False
@@ -6,12 +6,177 @@
 # by the Free Software Foundation, either version 3 of the License, or
 # (at your option) any later version.
 
-from typing import List
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from UM.Logger import Logger
 
 from .TransitionData import TransitionData
 
 
+# Slack for float noise when a boundary falls exactly on a layer
+_LAYER_EPSILON = 1e-9
+
+# Cached section results kept across calculations before the cache is reset
+_SECTION_CACHE_MAX_ENTRIES = 256
+
+# Separator line for log output and summaries
+_BANNER = "=" * 60
+
+# Z values are snapped to 6 decimals of a mm (whole nanometres) to drop float noise,
+# the same precision as the original round(z, 6)
+_Z_UNITS_PER_MM = 1_000_000
+
+# Values within this fraction of a Z unit of a whole unit are treated as exact
+_Z_EXACT_TOLERANCE = 1e-3
+
+# Modulo remainders within 0.001mm of a layer boundary count as aligned on it
+_ALIGNED_TOLERANCE = 0.001
+_ALIGNED_REMAINDER_UNITS = round(_ALIGNED_TOLERANCE * _Z_UNITS_PER_MM)
+
+
+@dataclass(slots=True)
+class _SectionInputs:
+    """Validated per-section inputs: the user's section config joined with its profile parameters."""
+    
+    section_number: int
+    profile_id: str
+    start_height: float
+    end_height: Optional[float]
+    layer_height: float
+    initial_layer_height: float
+    profile_fields: dict  # TransitionData keyword arguments shared by all sections using this profile
+    
+    @classmethod
+    def from_config(cls, section_config: dict, profile: dict, profile_fields: dict) -> "_SectionInputs":
+        """Join a section config with the parameters read for its profile."""
+        return cls(
+            section_number=section_config['section_number'],
+            profile_id=section_config['profile_id'],
+            start_height=section_config.get('start_height', 0.0),
+            end_height=section_config.get('end_height'),
+            layer_height=profile['layer_height'],
+            initial_layer_height=profile['initial_layer_height'],
+            profile_fields=profile_fields
+        )
+    
+    def fingerprint(self) -> tuple:
+        """Hashable key covering every input that affects this section's result."""
+        return (self.section_number, self.profile_id, self.start_height, self.end_height,
+                self.layer_height, self.initial_layer_height, tuple(self.profile_fields.items()))
+
+
+def _profile_transition_fields(profile: dict) -> dict:
+    """Resolve the profile-level TransitionData fields, applying defaults, in a single pass."""
+    get = profile.get
+    return {
+        'profile_name': get('profile_name'),
+        'material_shrinkage_percentage_z': get('material_shrinkage_percentage_z', 100.0),
+        'retraction_enabled': get('retraction_enabled', True),
+        'retraction_amount': get('retraction_amount', 2.0),
+        'retraction_speed': get('retraction_speed', 35.0),
+        'prime_speed': get('prime_speed', 30.0),
+    }
+
+
+def _snap_z(z: float) -> float:
+    """Round a non-negative Z value (mm) to 6 decimals."""
+    return int(z * _Z_UNITS_PER_MM + 0.5) / _Z_UNITS_PER_MM
+
+
+def _z_at_layer(start_z: float, layer_height: float, layer_count: int) -> float:
+    """Z after layer_count layers of layer_height above start_z, computed without accumulating error."""
+    return start_z + layer_count * layer_height
+
+
+def _modulo_initial_layer(start_z: float, layer_height: float) -> float:
+    """
+    Initial layer height that puts a pattern of layer_height on the same grid as start_z.
+    
+    Implements calculated_layer_height_0_for_b = section_A_calculated_transition_z % layer_height_b.
+    When both values have at most 6 decimals (the usual case without shrinkage
+    compensation) the modulo is done exactly in integer Z units; otherwise it uses math.fmod.
+    A remainder within 0.001mm of zero or of a full layer means start_z is already
+    on a layer boundary, in which case a full layer_height is returned.
+    Pure arithmetic, so it is the single place to change for faster numeric code paths.
+    """
+    start_units = round(start_z * _Z_UNITS_PER_MM)
+    layer_units = round(layer_height * _Z_UNITS_PER_MM)
+    if (layer_units > 0
+            and abs(start_z * _Z_UNITS_PER_MM - start_units) < _Z_EXACT_TOLERANCE
+            and abs(layer_height * _Z_UNITS_PER_MM - layer_units) < _Z_EXACT_TOLERANCE):
+        remainder_units = start_units % layer_units
+        if remainder_units <= _ALIGNED_REMAINDER_UNITS or remainder_units >= layer_units - _ALIGNED_REMAINDER_UNITS:
+            # Remainder (almost) zero or a full layer: we're aligned on a layer boundary
+            return layer_height
+        return remainder_units / _Z_UNITS_PER_MM
+    
+    adjusted_initial = _snap_z(math.fmod(start_z, layer_height))  # Avoid floating point errors
+    if (math.isclose(adjusted_initial, 0.0, abs_tol=_ALIGNED_TOLERANCE)
+            or math.isclose(adjusted_initial, layer_height, abs_tol=_ALIGNED_TOLERANCE)):
+        # Remainder (almost) zero or a full layer: we're aligned on a layer boundary
+        adjusted_initial = layer_height
+    return adjusted_initial
+
+
+def _last_layer_within(start_z: float, layer_height: float, limit_z: float) -> int:
+    """
+    Number of the last layer of a uniform pattern that ends at or below limit_z.
+    
+    Layer k of the pattern ends at start_z + k * layer_height (k >= 1), so this is
+    solved with one floor division instead of enumerating layers.
+    
+    Returns:
+        The layer number, or 0 if not even the first layer fits
+    """
+    layer_count = math.floor((limit_z - start_z) / layer_height + _LAYER_EPSILON)
+    return layer_count if layer_count > 0 else 0
+
+
+def _following_section_end_layer(start_z: float, layer_height: float, user_end_z: float) -> int:
+    """
+    Number of the layer a following section ends on (counted from start_z).
+    
+    A layer landing exactly on the user boundary ends the section there. Otherwise
+    the section ends on the first layer above the boundary, i.e. the last layer
+    within a tolerance of one layer_height.
+    
+    Returns:
+        The layer number, or 0 if not even the first layer fits
+    """
+    last_layer_num = _last_layer_within(start_z, layer_height, user_end_z)
+    if last_layer_num and _snap_z(_z_at_layer(start_z, layer_height, last_layer_num)) == _snap_z(user_end_z):
+        return last_layer_num
+    return _last_layer_within(start_z, layer_height, user_end_z + layer_height)
+
+
+def find_overlapping_sections(heights: List[Tuple[float, Optional[float]]]) -> set:
+    """
+    Indices of sections whose start lies below the end of any section starting earlier.
+    
+    Sections are swept in start-height order, so overlaps are found even if the list
+    is unsorted or one section contains others. Sections without an end (the open
+    last section) don't extend the covered range.
+    
+    Args:
+        heights: (start_height, end_height) per section; end_height may be None,
+            a None start_height counts as 0
+        
+    Returns:
+        Set of indices into heights of the overlapping sections
+    """
+    overlapping = set()
+    max_end = None
+    for index in sorted(range(len(heights)), key=lambda index: heights[index][0] or 0):
+        start_height, end_height = heights[index]
+        start_height = start_height or 0
+        if max_end and start_height < max_end:
+            overlapping.add(index)
+        if end_height is not None and (max_end is None or end_height > max_end):
+            max_end = end_height
+    return overlapping
+
+
 class TransitionCalculator:
     """
     SINGLE SOURCE OF TRUTH for all transition calculations in HellaFusion.
@@ -37,6 +202,10 @@ class TransitionCalculator:
         """Initialize the calculator."""
         self._transitions: List[TransitionData] = []
         self._validation_errors: List[str] = []
+        
+        # Section results from earlier calculations on this instance, keyed by every input
+        # they depend on. TransitionData is immutable, so cached results can be shared.
+        self._section_cache: Dict[tuple, TransitionData] = {}
     
     def calculate_all_transitions(
         self, 
@@ -57,7 +226,8 @@ class TransitionCalculator:
                 - intent_category: Optional[str]
                 - intent_container_id: Optional[str]
             
-            profile_reader: Callable that switches to a profile and returns its parameters:
+            profile_reader: Callable that switches to a profile and returns its parameters
+                (called once per unique profile, one call at a time):
                 def read_profile(profile_id, intent_category, intent_container_id) -> dict:
                     return {
                         'layer_height': float,
@@ -79,48 +249,63 @@ class TransitionCalculator:
             Logger.log("e", "TransitionCalculator: No sections provided")
             return []
         
-        Logger.log("i", "=" * 60)
+        Logger.log("i", _BANNER)
         Logger.log("i", "TransitionCalculator: Starting calculation")
-        Logger.log("i", "=" * 60)
+        Logger.log("i", _BANNER)
         
         # STEP 1: Read profile parameters for each section
-        profile_params = []
+        # Sections often reuse a profile; reading one means switching Cura's active
+        # profile, so each unique profile is read only once per calculation
+        profile_cache: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[Optional[dict], Optional[dict]]] = {}
+        
+        section_inputs = []
         for section_config in sections_config:
             try:
-                params = profile_reader(
+                profile_key = (
                     section_config['profile_id'],
                     section_config.get('intent_category'),
                     section_config.get('intent_container_id')
                 )
+                if profile_key in profile_cache:
+                    params, profile_fields = profile_cache[profile_key]
+                else:
+                    params = profile_reader(*profile_key)
+                    profile_fields = _profile_transition_fields(params) if params else None
+                    profile_cache[profile_key] = (params, profile_fields)
                 
                 if not params:
-                    Logger.log("e", f"Failed to read profile {section_config['profile_id']}")
+                    Logger.log("e", "Failed to read profile %s", section_config['profile_id'])
                     continue
                 
-                profile_params.append({
-                    **section_config,
-                    **params
-                })
+                section_inputs.append(_SectionInputs.from_config(section_config, params, profile_fields))
                 
             except Exception as e:
-                Logger.log("e", f"Error reading profile for section {section_config['section_number']}: {e}")
+                Logger.log("e", "Error reading profile for section %s: %s", section_config['section_number'], e)
                 continue
         
-        if not profile_params:
+        if not section_inputs:
             Logger.log("e", "TransitionCalculator: No valid profiles found")
             return []
         
         # STEP 2: Iteratively calculate transitions (each section becomes base for next)
-        for i, params in enumerate(profile_params):
-            section_num = params['section_number']
+        if len(self._section_cache) > _SECTION_CACHE_MAX_ENTRIES:
+            self._section_cache.clear()
+        
+        for i, inputs in enumerate(section_inputs):
+            # Recalculations usually leave most sections unchanged; reuse their results
+            prev_end_z = self._transitions[i - 1].actual_end_z if i else None
+            fingerprint = (i == 0, prev_end_z, inputs.fingerprint())
+            transition = self._section_cache.get(fingerprint)
             
-            if i == 0:
-                # Section 1: Base pattern (immutable)
-                transition = self._calculate_first_section(params)
-            else:
-                # Section 2+: Pattern match with previous section
-                prev_transition = self._transitions[i - 1]
-                transition = self._calculate_following_section(params, prev_transition)
+            if transition is None:
+                if i == 0:
+                    # Section 1: Base pattern (immutable)
+                    transition = self._calculate_first_section(inputs)
+                else:
+                    # Section 2+: Pattern match with previous section
+                    prev_transition = self._transitions[i - 1]
+                    transition = self._calculate_following_section(inputs, prev_transition)
+                self._section_cache[fingerprint] = transition
             
             self._transitions.append(transition)
             Logger.log("i", transition.get_summary())
@@ -128,19 +313,19 @@ class TransitionCalculator:
         # STEP 3: Validate all transitions
         self._validate_all_transitions()
         
-        Logger.log("i", "=" * 60)
-        Logger.log("i", f"TransitionCalculator: Completed {len(self._transitions)} sections")
+        Logger.log("i", _BANNER)
+        Logger.log("i", "TransitionCalculator: Completed %d sections", len(self._transitions))
         if self._validation_errors:
-            Logger.log("w", f"Validation found {len(self._validation_errors)} issues:")
+            Logger.log("w", "Validation found %d issues:", len(self._validation_errors))
             for error in self._validation_errors:
-                Logger.log("w", f"  - {error}")
+                Logger.log("w", "  - %s", error)
         else:
             Logger.log("i", "✓ All transitions validated successfully")
-        Logger.log("i", "=" * 60)
+        Logger.log("i", _BANNER)
         
         return self._transitions
     
-    def _calculate_first_section(self, params: dict) -> TransitionData:
+    def _calculate_first_section(self, inputs: _SectionInputs) -> TransitionData:
         """
         Calculate Section 1 (base pattern).
         
@@ -151,10 +336,10 @@ class TransitionCalculator:
             layer_number_a_to_b = int((user_end_z - layer_height_0_a) / layer_height_a) + 1
             actual_end_z = ((layer_number_a_to_b - 1) * layer_height_a) + layer_height_0_a
         """
-        section_num = params['section_number']
-        user_end_z = params.get('end_height')
-        layer_height = params['layer_height']
-        initial_layer_height = params['initial_layer_height']
+        section_num = inputs.section_number
+        user_end_z = inputs.end_height
+        layer_height = inputs.layer_height
+        initial_layer_height = inputs.initial_layer_height
         
         # Section 1 always starts at Z=0 with original layer heights
         actual_start_z = 0.0
@@ -164,25 +349,26 @@ class TransitionCalculator:
         actual_end_z = None
         end_layer_num = None
         total_layers = None
+        deviation = 0.0
         
         if user_end_z is not None:
             # Formula from planofaction.md:
             # layer_number_a_to_b = int((transition_z - layer_height_0_a) / layer_height_a) + 1
-            remaining_height = user_end_z - initial_layer_height
-            layer_number_a_to_b = int(remaining_height / layer_height) + 1
+            # i.e. the regular layers that fit between layer 0 and the boundary, plus layer 0.
+            # Solved with the shared epsilon-guarded helper so a boundary exactly on a layer
+            # is not lost to float noise in the division.
+            layer_number_a_to_b = _last_layer_within(initial_layer_height, layer_height, user_end_z) + 1
             
             # actual_end_z = ((layer_number - 1) * layer_height) + layer_height_0
-            actual_end_z = ((layer_number_a_to_b - 1) * layer_height) + initial_layer_height
+            actual_end_z = _snap_z(_z_at_layer(initial_layer_height, layer_height, layer_number_a_to_b - 1))
             
             end_layer_num = layer_number_a_to_b
             total_layers = layer_number_a_to_b + 1  # +1 for layer 0
-        
-        deviation = abs(actual_end_z - user_end_z) if actual_end_z and user_end_z else 0.0
+            deviation = abs(actual_end_z - user_end_z)
         
         return TransitionData(
             section_num=section_num,
-            profile_id=params['profile_id'],
-            profile_name=params.get('profile_name'),
+            profile_id=inputs.profile_id,
             user_start_z=0.0,
             user_end_z=user_end_z,
             actual_start_z=actual_start_z,
@@ -190,14 +376,10 @@ class TransitionCalculator:
             layer_height=layer_height,
             original_initial_layer_height=initial_layer_height,
             adjusted_initial_layer_height=adjusted_initial,
-            material_shrinkage_percentage_z=params.get('material_shrinkage_percentage_z', 100.0),
             start_layer_num=0,
             end_layer_num=end_layer_num,
             total_layers=total_layers,
-            retraction_enabled=params.get('retraction_enabled', True),
-            retraction_amount=params.get('retraction_amount', 2.0),
-            retraction_speed=params.get('retraction_speed', 35.0),
-            prime_speed=params.get('prime_speed', 30.0),
+            **inputs.profile_fields,
             alignment_type='base_pattern',
             gap_with_previous=0.0,
             deviation_from_user=deviation
@@ -205,7 +387,7 @@ class TransitionCalculator:
     
     def _calculate_following_section(
         self, 
-        params: dict, 
+        inputs: _SectionInputs, 
         prev_transition: TransitionData
     ) -> TransitionData:
         """
@@ -218,34 +400,28 @@ class TransitionCalculator:
             calculated_layer_height_0_for_b = section_A_calculated_transition_z % layer_height_b
             layer_number_start_b = ((section_A_calculated_transition_z - calculated_layer_height_0_for_b) / layer_height_b) + 2
         """
-        section_num = params['section_number']
-        user_start_z = params['start_height']
-        user_end_z = params.get('end_height')
-        layer_height = params['layer_height']
-        original_initial = params['initial_layer_height']
+        section_num = inputs.section_number
+        user_start_z = inputs.start_height
+        user_end_z = inputs.end_height
+        layer_height = inputs.layer_height
+        original_initial = inputs.initial_layer_height
         
         # CRITICAL: This section MUST start where previous section ACTUALLY ended
         # This is the ITERATIVE PATTERN MATCHING principle
         actual_start_z = prev_transition.actual_end_z
         
         if actual_start_z is None:
-            Logger.log("e", f"Section {section_num}: Previous section has no end point")
+            Logger.log("e", "Section %s: Previous section has no end point", section_num)
             actual_start_z = user_start_z
         
         # MODULO CALCULATION for perfect gap-free alignment
         # Formula from planofaction.md:
         # calculated_layer_height_0_for_b = section_A_calculated_transition_z % layer_height_b
-        adjusted_initial = actual_start_z % layer_height
-        
-        # Handle edge cases
-        adjusted_initial = round(adjusted_initial, 6)  # Avoid floating point errors
-        if adjusted_initial < 0.001:
-            # Very small value means we're aligned on a layer boundary
-            adjusted_initial = layer_height
+        adjusted_initial = _modulo_initial_layer(actual_start_z, layer_height)
         
         # Validate adjusted initial is reasonable
         if adjusted_initial <= 0 or adjusted_initial > layer_height:
-            Logger.log("w", f"Section {section_num}: Invalid adjusted_initial {adjusted_initial:.6f}, using original")
+            Logger.log("w", "Section %s: Invalid adjusted_initial %.6f, using original", section_num, adjusted_initial)
             adjusted_initial = original_initial
             alignment_type = 'fallback_invalid_modulo'
         else:
@@ -257,31 +433,17 @@ class TransitionCalculator:
         total_layers = None
         
         if user_end_z is not None:
-            # Generate layer boundaries to find where pattern actually ends
+            # Find the last layer within tolerance of the user boundary
             # CRITICAL: adjusted_initial is just a buffer for calculations, NOT a physical layer
             # All layers in following sections use layer_height!
-            layer_boundaries = []
-            current_z = actual_start_z + layer_height  # First ACTUAL layer uses layer_height
-            layer_num = 1
+            last_layer_num = _following_section_end_layer(actual_start_z, layer_height, user_end_z)
             
-            # Generate enough layers to cover the range
-            while current_z <= user_end_z + layer_height:
-                layer_boundaries.append((layer_num, round(current_z, 6)))
-                current_z += layer_height
-                layer_num += 1
-            
-            # Find last layer within tolerance of user boundary
-            tolerance = layer_height
-            valid_boundaries = [
-                (ln, z) for ln, z in layer_boundaries 
-                if z <= user_end_z + tolerance
-            ]
-            
-            if valid_boundaries:
-                end_layer_num, actual_end_z = valid_boundaries[-1]
+            if last_layer_num:
+                end_layer_num = last_layer_num
+                actual_end_z = _snap_z(_z_at_layer(actual_start_z, layer_height, end_layer_num))
                 total_layers = end_layer_num
             else:
-                Logger.log("w", f"Section {section_num}: No valid end boundary found")
+                Logger.log("w", "Section %s: No valid end boundary found", section_num)
                 actual_end_z = user_end_z
                 end_layer_num = 0
         
@@ -293,8 +455,7 @@ class TransitionCalculator:
         
         return TransitionData(
             section_num=section_num,
-            profile_id=params['profile_id'],
-            profile_name=params.get('profile_name'),
+            profile_id=inputs.profile_id,
             user_start_z=user_start_z,
             user_end_z=user_end_z,
             actual_start_z=actual_start_z,
@@ -302,47 +463,57 @@ class TransitionCalculator:
             layer_height=layer_height,
             original_initial_layer_height=original_initial,
             adjusted_initial_layer_height=adjusted_initial,
-            material_shrinkage_percentage_z=params.get('material_shrinkage_percentage_z', 100.0),
             start_layer_num=None,  # Will be calculated relative to section start
             end_layer_num=end_layer_num,
             total_layers=total_layers,
-            retraction_enabled=params.get('retraction_enabled', True),
-            retraction_amount=params.get('retraction_amount', 2.0),
-            retraction_speed=params.get('retraction_speed', 35.0),
-            prime_speed=params.get('prime_speed', 30.0),
+            **inputs.profile_fields,
             alignment_type=alignment_type,
             gap_with_previous=gap,
             deviation_from_user=deviation
         )
     
-    def _validate_all_transitions(self):
-        """Validate all calculated transitions for consistency and physical validity."""
-        self._validation_errors = []
+    def _validate_all_transitions(self, abort_on_critical: bool = True):
+        """
+        Validate all calculated transitions for consistency and physical validity.
+        
+        Args:
+            abort_on_critical: Stop at the first transition with physically impossible
+                layer heights; every later section is derived from it, so further
+                checks would only report follow-up noise.
+        """
+        if not self._transitions:
+            self._validation_errors = []
+            return
         
         # Validate each transition individually
+        errors = []
         for transition in self._transitions:
-            is_valid, errors = transition.validate()
-            if not is_valid:
-                self._validation_errors.extend(errors)
+            errors.extend(transition.validate_iter())
+            if abort_on_critical and transition.has_critical_error:
+                self._validation_errors = errors
+                return
         
         # Validate relationships between transitions
-        for i in range(len(self._transitions) - 1):
-            current = self._transitions[i]
-            next_trans = self._transitions[i + 1]
+        for current, next_trans in zip(self._transitions, self._transitions[1:]):
+            current_end_z = current.actual_end_z
+            if current_end_z is None:
+                continue
+            next_start_z = next_trans.actual_start_z
             
             # Check continuity: next section must start where current ends
-            if current.actual_end_z is not None:
-                gap = abs(next_trans.actual_start_z - current.actual_end_z)
-                if gap > 0.01:  # More than 10 microns
-                    self._validation_errors.append(
-                        f"Gap between Section {current.section_num} and {next_trans.section_num}: {gap:.3f}mm"
-                    )
-                
-                # Check overlap
-                if next_trans.actual_start_z < current.actual_end_z - 0.001:
-                    self._validation_errors.append(
-                        f"Overlap between Section {current.section_num} and {next_trans.section_num}"
-                    )
+            gap = abs(next_start_z - current_end_z)
+            if gap > 0.01:  # More than 10 microns
+                errors.append(
+                    f"Gap between Section {current.section_num} and {next_trans.section_num}: {gap:.3f}mm"
+                )
+            
+            # Check overlap
+            if next_start_z < current_end_z - 0.001:
+                errors.append(
+                    f"Overlap between Section {current.section_num} and {next_trans.section_num}"
+                )
+        
+        self._validation_errors = errors
     
     def get_transitions(self) -> List[TransitionData]:
         """Get the calculated transitions."""
@@ -358,25 +529,14 @@ class TransitionCalculator:
     
     def get_summary(self) -> str:
         """Get human-readable summary of all transitions."""
-        lines = []
-        lines.append("=" * 60)
-        lines.append("TRANSITION CALCULATION SUMMARY")
-        lines.append("=" * 60)
-        
-        for transition in self._transitions:
-            lines.append("")
-            lines.append(transition.get_summary())
+        banner = _BANNER
+        sections_text = "".join(f"\n\n{transition.get_summary()}" for transition in self._transitions)
         
         if self._validation_errors:
-            lines.append("")
-            lines.append("=" * 60)
-            lines.append("VALIDATION ERRORS")
-            lines.append("=" * 60)
-            for error in self._validation_errors:
-                lines.append(f"  ⚠️  {error}")
+            errors_text = "\n".join(f"  ⚠️  {error}" for error in self._validation_errors)
+            result_text = f"{banner}\nVALIDATION ERRORS\n{banner}\n{errors_text}"
         else:
-            lines.append("")
-            lines.append("✓ All transitions validated successfully")
+            result_text = "✓ All transitions validated successfully"
         
-        lines.append("=" * 60)
-        return "\n".join(lines)
+        return (f"{banner}\nTRANSITION CALCULATION SUMMARY\n{banner}"
+                f"{sections_text}\n\n{result_text}\n{banner}")
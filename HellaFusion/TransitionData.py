@@ -6,17 +6,27 @@
 # by the Free Software Foundation, either version 3 of the License, or
 # (at your option) any later version.
 
-from dataclasses import dataclass
-from typing import Optional, Dict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional, Mapping, Iterator
 
 
-@dataclass
+# Validation thresholds
+_MAX_GAP_MM = 0.01  # More than 10 microns between sections is a gap
+_INITIAL_LAYER_FACTOR_MAX = 4  # Adjusted initial layer may be at most this many regular layers
+_USER_DEVIATION_FACTOR_MAX = 2  # Actual boundaries may deviate this many layers from the user's
+
+
+@dataclass(frozen=True, slots=True)
 class TransitionData:
     """
     Immutable data class representing a single section's transition information.
     
     This is the SINGLE SOURCE OF TRUTH for where a section starts, ends, and
     what layer heights it uses. All other code must reference these values.
+    
+    Instances are frozen and hashable; use dataclasses.replace() to derive a
+    modified copy.
     """
     
     # Section identification
@@ -54,13 +64,15 @@ class TransitionData:
     gap_with_previous: float = 0.0
     deviation_from_user: float = 0.0
     
-    # Additional metadata
-    metadata: Dict = None
+    # Additional metadata (excluded from equality and hashing, read-only once set)
+    metadata: Mapping = field(default_factory=dict, compare=False, hash=False)
+    
+    # Memoized get_summary() text; the summary is logged by both the calculator and the controller
+    _summary_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False, hash=False)
     
     def __post_init__(self):
-        """Initialize metadata dict if not provided."""
-        if self.metadata is None:
-            object.__setattr__(self, 'metadata', {})
+        """Store metadata as a read-only copy so frozen instances stay immutable."""
+        object.__setattr__(self, 'metadata', MappingProxyType(dict(self.metadata)))
     
     @staticmethod
     def convert_from_cura(value: float, shrinkage_factor: float, apply_compensation: bool = True) -> float:
@@ -101,6 +113,39 @@ class TransitionData:
             return value  # Skip compensation
         return value * (shrinkage_factor / 100.0)
     
+    @staticmethod
+    def make_from_cura_scaler(shrinkage_factor: float, apply_compensation: bool = True) -> float:
+        """Get the multiplier equivalent to convert_from_cura() for a given shrinkage factor.
+        
+        Use this when converting several values with the same factor: compute the scaler
+        once, then multiply each Cura value by it instead of dividing per value.
+        
+        Args:
+            shrinkage_factor: material_shrinkage_percentage_z (e.g., 100.1)
+            apply_compensation: If False, skip shrinkage compensation (scaler is 1.0)
+        
+        Returns:
+            Multiplier that turns a Cura layer height into the actual value
+        """
+        if not apply_compensation or shrinkage_factor == 0:
+            return 1.0  # Skip compensation or avoid division by zero
+        return 100.0 / shrinkage_factor
+    
+    @staticmethod
+    def make_to_cura_scaler(shrinkage_factor: float, apply_compensation: bool = True) -> float:
+        """Get the multiplier equivalent to convert_to_cura() for a given shrinkage factor.
+        
+        Args:
+            shrinkage_factor: material_shrinkage_percentage_z (e.g., 100.1)
+            apply_compensation: If False, skip shrinkage compensation (scaler is 1.0)
+        
+        Returns:
+            Multiplier that turns an actual layer height into Cura format
+        """
+        if not apply_compensation:
+            return 1.0  # Skip compensation
+        return shrinkage_factor / 100.0
+    
     @property
     def is_first_section(self) -> bool:
         """Check if this is the first section (starts at Z=0)."""
@@ -124,72 +169,90 @@ class TransitionData:
         return self.actual_end_z - self.actual_start_z
     
     def get_summary(self) -> str:
-        """Get human-readable summary of this transition."""
-        lines = []
-        lines.append(f"Section {self.section_num}: {self.profile_name or self.profile_id}")
+        """Get human-readable summary of this transition (formatted once per instance)."""
+        if self._summary_cache is not None:
+            return self._summary_cache
         
         # Boundaries
         if self.is_last_section:
-            lines.append(f"  Z Range: {self.actual_start_z:.3f}mm → Top")
-            lines.append(f"  User Requested: {self.user_start_z:.1f}mm → Top")
+            end_text = "Top"
+            user_end_text = "Top"
         else:
-            lines.append(f"  Z Range: {self.actual_start_z:.3f}mm → {self.actual_end_z:.3f}mm")
-            lines.append(f"  User Requested: {self.user_start_z:.1f}mm → {self.user_end_z:.1f}mm")
+            end_text = f"{self.actual_end_z:.3f}mm"
+            user_end_text = f"{self.user_end_z:.1f}mm"
         
         # Layer info
         if self.needs_initial_adjustment:
-            lines.append(f"  Layer Heights: initial={self.original_initial_layer_height:.3f}mm → {self.adjusted_initial_layer_height:.3f}mm (adjusted), regular={self.layer_height:.3f}mm")
+            initial_text = f"{self.original_initial_layer_height:.3f}mm → {self.adjusted_initial_layer_height:.3f}mm (adjusted)"
         else:
-            lines.append(f"  Layer Heights: initial={self.original_initial_layer_height:.3f}mm, regular={self.layer_height:.3f}mm")
+            initial_text = f"{self.original_initial_layer_height:.3f}mm"
         
         # Alignment
-        lines.append(f"  Alignment: {self.alignment_type}")
-        if self.gap_with_previous > 0.0001:
-            lines.append(f"  Gap: {self.gap_with_previous:.3f}mm")
-        if self.deviation_from_user > 0.1:
-            lines.append(f"  ⚠️  Deviation from user boundary: {self.deviation_from_user:.3f}mm")
+        gap_text = f"\n  Gap: {self.gap_with_previous:.3f}mm" if self.gap_with_previous > 0.0001 else ""
+        deviation_text = (f"\n  ⚠️  Deviation from user boundary: {self.deviation_from_user:.3f}mm"
+                          if self.deviation_from_user > 0.1 else "")
         
-        return "\n".join(lines)
+        summary = (f"Section {self.section_num}: {self.profile_name or self.profile_id}\n"
+                   f"  Z Range: {self.actual_start_z:.3f}mm → {end_text}\n"
+                   f"  User Requested: {self.user_start_z:.1f}mm → {user_end_text}\n"
+                   f"  Layer Heights: initial={initial_text}, regular={self.layer_height:.3f}mm\n"
+                   f"  Alignment: {self.alignment_type}"
+                   f"{gap_text}{deviation_text}")
+        object.__setattr__(self, '_summary_cache', summary)
+        return summary
     
-    def validate(self) -> tuple[bool, list[str]]:
+    @property
+    def has_critical_error(self) -> bool:
+        """Check if the layer heights are physically impossible (later checks are then meaningless)."""
+        return self.layer_height <= 0 or self.adjusted_initial_layer_height <= 0
+    
+    def validate_iter(self) -> Iterator[str]:
         """
-        Validate this transition data for consistency and physical validity.
+        Yield validation errors for this transition one at a time.
         
-        Returns:
-            (is_valid, list_of_errors)
+        Lets callers stop at the first error, e.g. any(transition.validate_iter()).
         """
-        errors = []
+        layer_height = self.layer_height
+        max_user_deviation = layer_height * _USER_DEVIATION_FACTOR_MAX
         
         # Check basic parameters
-        if self.layer_height <= 0:
-            errors.append(f"Section {self.section_num}: Invalid layer_height {self.layer_height}")
+        if layer_height <= 0:
+            yield f"Section {self.section_num}: Invalid layer_height {self.layer_height}"
         
         if self.adjusted_initial_layer_height <= 0:
-            errors.append(f"Section {self.section_num}: Invalid adjusted_initial_layer_height {self.adjusted_initial_layer_height}")
+            yield f"Section {self.section_num}: Invalid adjusted_initial_layer_height {self.adjusted_initial_layer_height}"
         
-        if self.adjusted_initial_layer_height > self.layer_height * 4:
-            errors.append(f"Section {self.section_num}: adjusted_initial_layer_height ({self.adjusted_initial_layer_height:.3f}) is unusually large compared to layer_height ({self.layer_height:.3f})")
+        if self.adjusted_initial_layer_height > layer_height * _INITIAL_LAYER_FACTOR_MAX:
+            yield f"Section {self.section_num}: adjusted_initial_layer_height ({self.adjusted_initial_layer_height:.3f}) is unusually large compared to layer_height ({self.layer_height:.3f})"
         
         # Check Z boundaries
         if not self.is_first_section and self.actual_start_z <= 0:
-            errors.append(f"Section {self.section_num}: actual_start_z must be > 0 for non-first sections")
+            yield f"Section {self.section_num}: actual_start_z must be > 0 for non-first sections"
         
         if self.actual_end_z is not None:
             if self.actual_end_z <= self.actual_start_z:
-                errors.append(f"Section {self.section_num}: actual_end_z ({self.actual_end_z:.3f}) must be > actual_start_z ({self.actual_start_z:.3f})")
+                yield f"Section {self.section_num}: actual_end_z ({self.actual_end_z:.3f}) must be > actual_start_z ({self.actual_start_z:.3f})"
         
         # Check deviation from user expectations
-        if abs(self.actual_start_z - self.user_start_z) > self.layer_height * 2:
-            errors.append(f"Section {self.section_num}: Large deviation from user start boundary ({abs(self.actual_start_z - self.user_start_z):.3f}mm)")
+        if abs(self.actual_start_z - self.user_start_z) > max_user_deviation:
+            yield f"Section {self.section_num}: Large deviation from user start boundary ({abs(self.actual_start_z - self.user_start_z):.3f}mm)"
         
         if self.user_end_z is not None and self.actual_end_z is not None:
-            if abs(self.actual_end_z - self.user_end_z) > self.layer_height * 2:
-                errors.append(f"Section {self.section_num}: Large deviation from user end boundary ({abs(self.actual_end_z - self.user_end_z):.3f}mm)")
+            if abs(self.actual_end_z - self.user_end_z) > max_user_deviation:
+                yield f"Section {self.section_num}: Large deviation from user end boundary ({abs(self.actual_end_z - self.user_end_z):.3f}mm)"
         
         # Check gap
-        if self.gap_with_previous > 0.01:  # More than 10 microns
-            errors.append(f"Section {self.section_num}: Non-zero gap with previous section ({self.gap_with_previous:.3f}mm)")
+        if self.gap_with_previous > _MAX_GAP_MM:
+            yield f"Section {self.section_num}: Non-zero gap with previous section ({self.gap_with_previous:.3f}mm)"
+    
+    def validate(self) -> tuple[bool, list[str]]:
+        """
+        Validate this transition data for consistency and physical validity.
         
+        Returns:
+            (is_valid, list_of_errors)
+        """
+        errors = list(self.validate_iter())
         return (len(errors) == 0, errors)
     
     def to_dict(self) -> dict:
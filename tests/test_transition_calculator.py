@@ -0,0 +1,175 @@
+# HellaFusion Plugin for Cura
+# Based on work by GregValiant (Greg Foresi) and HellAholic
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+"""Regression tests for TransitionCalculator section boundaries and overlap detection."""
+
+import importlib
+import os
+import sys
+import types
+from decimal import Decimal
+
+import pytest
+
+# TransitionCalculator only needs UM.Logger; outside Cura provide a silent one
+try:
+    import UM.Logger  # noqa: F401
+except ImportError:
+    _um = types.ModuleType("UM")
+    _um_logger = types.ModuleType("UM.Logger")
+    _um_logger.Logger = type("Logger", (), {"log": staticmethod(lambda *args: None)})
+    _um.Logger = _um_logger
+    sys.modules.setdefault("UM", _um)
+    sys.modules.setdefault("UM.Logger", _um_logger)
+
+# Load the calculator modules without the plugin's __init__, which needs Cura
+_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "HellaFusion")
+_package = types.ModuleType("hellafusion_under_test")
+_package.__path__ = [_PLUGIN_DIR]
+sys.modules.setdefault("hellafusion_under_test", _package)
+_calculator_module = importlib.import_module("hellafusion_under_test.TransitionCalculator")
+TransitionCalculator = _calculator_module.TransitionCalculator
+find_overlapping_sections = _calculator_module.find_overlapping_sections
+_last_layer_within = _calculator_module._last_layer_within
+_following_section_end_layer = _calculator_module._following_section_end_layer
+_z_at_layer = _calculator_module._z_at_layer
+_snap_z = _calculator_module._snap_z
+
+
+def _calculate(sections):
+    """Run the calculator for (layer_height, initial_layer_height, end_height) sections."""
+    profiles = {}
+    config = []
+    start_height = 0.0
+    for index, (layer_height, initial_layer_height, end_height) in enumerate(sections):
+        profile_id = f"profile_{index}"
+        profiles[profile_id] = {'layer_height': layer_height,
+                                'initial_layer_height': initial_layer_height,
+                                'profile_name': profile_id}
+        config.append({'section_number': index + 1, 'start_height': start_height,
+                       'end_height': end_height, 'profile_id': profile_id})
+        start_height = end_height
+    
+    transitions = TransitionCalculator().calculate_all_transitions(
+        config, lambda profile_id, intent_category, intent_container_id: dict(profiles[profile_id]))
+    return [(round(t.actual_start_z, 6),
+             None if t.actual_end_z is None else round(t.actual_end_z, 6),
+             round(t.adjusted_initial_layer_height, 6)) for t in transitions]
+
+
+@pytest.mark.parametrize("sections, expected", [
+    # Section 2 has a layer exactly at 6.25mm and must stop there, not one layer above
+    ([(0.3, 0.25, 1.0), (0.2, 0.25, 6.25), (0.15, 0.27, 8.15), (0.12, 0.3, None)],
+     [(0.0, 0.85, 0.25), (0.85, 6.25, 0.05), (6.25, 8.2, 0.1), (8.2, None, 0.04)]),
+    # Every boundary is on a layer of its section
+    ([(0.2, 0.2, 1.0), (0.1, 0.2, 3.0), (0.3, 0.3, None)],
+     [(0.0, 1.0, 0.2), (1.0, 3.0, 0.1), (3.0, None, 0.3)]),
+    # Boundaries between layers end on the first layer above them
+    ([(0.2, 0.3, 5.05), (0.12, 0.3, 12.3), (0.2, 0.3, 20.0), (0.28, 0.3, None)],
+     [(0.0, 4.9, 0.3), (4.9, 12.34, 0.1), (12.34, 20.14, 0.14), (20.14, None, 0.26)]),
+])
+def test_pinned_section_boundaries(sections, expected):
+    assert _calculate(sections) == expected
+
+
+
+# Copies of the original (pre-closed-form) end-of-section calculations, kept as the reference
+def _baseline_first_section_end(user_end_z, initial_layer_height, layer_height):
+    layer_number_a_to_b = int((user_end_z - initial_layer_height) / layer_height) + 1
+    return ((layer_number_a_to_b - 1) * layer_height) + initial_layer_height
+
+
+def _baseline_following_section_end(actual_start_z, layer_height, user_end_z):
+    layer_boundaries = []
+    current_z = actual_start_z + layer_height
+    layer_num = 1
+    while current_z <= user_end_z + layer_height:
+        layer_boundaries.append((layer_num, round(current_z, 6)))
+        current_z += layer_height
+        layer_num += 1
+    valid_boundaries = [(ln, z) for ln, z in layer_boundaries if z <= user_end_z + layer_height]
+    return valid_boundaries[-1][1] if valid_boundaries else None
+
+
+def _is_whole_number_of_layers(distance, layer_height):
+    """Exact (decimal) check whether a layer lands exactly on the boundary."""
+    return Decimal(distance) % Decimal(layer_height) == 0
+
+
+_GRID_LAYER_HEIGHTS = ["0.06", "0.1", "0.12", "0.15", "0.2", "0.25", "0.28", "0.3"]
+_GRID_INITIAL_LAYER_HEIGHTS = ["0.2", "0.25", "0.27", "0.3"]
+_GRID_START_HEIGHTS = ["0", "0.85", "2.4", "4.9", "6.74", "12.34"]
+_GRID_BOUNDARY_STEPS = [f"{step / 100:.2f}" for step in range(1, 301)]  # 0.01mm .. 3mm
+
+
+@pytest.mark.parametrize("layer_height", _GRID_LAYER_HEIGHTS)
+def test_first_section_end_against_original_loop(layer_height):
+    """
+    Section 1 matches the original formula except on boundary-exact inputs.
+    
+    Intended divergence: when a layer ends exactly on the user boundary, the section
+    ends on the boundary. The original int() truncation sometimes lost that layer to
+    float noise (e.g. 0.2 initial + 0.1 layers to 3.9 ended at 3.8).
+    """
+    lh = float(layer_height)
+    for initial in _GRID_INITIAL_LAYER_HEIGHTS:
+        initial_lh = float(initial)
+        for step in _GRID_BOUNDARY_STEPS:
+            user_end = Decimal(initial) + Decimal(step) * 4
+            user_end_z = float(user_end)
+            layer_number = _last_layer_within(initial_lh, lh, user_end_z) + 1
+            actual_end_z = _snap_z(_z_at_layer(initial_lh, lh, layer_number - 1))
+            baseline_end_z = round(_baseline_first_section_end(user_end_z, initial_lh, lh), 6)
+            
+            if _is_whole_number_of_layers(user_end - Decimal(initial), layer_height):
+                assert actual_end_z == user_end_z
+                assert baseline_end_z in (user_end_z, round(user_end_z - lh, 6))
+            else:
+                assert actual_end_z == baseline_end_z, (initial, layer_height, user_end_z)
+
+
+@pytest.mark.parametrize("layer_height", _GRID_LAYER_HEIGHTS)
+def test_following_section_end_against_original_loop(layer_height):
+    """
+    Following sections match the original layer loop except on boundary-exact inputs.
+    
+    Intended divergence: when a layer lands exactly on the user boundary, the section
+    ends there. The original loop's accumulated Z sometimes overshot by one layer
+    (e.g. 2.4 start, 0.15 layers to 3.75 ended at 3.9).
+    """
+    lh = float(layer_height)
+    for start in _GRID_START_HEIGHTS:
+        start_z = float(start)
+        for step in _GRID_BOUNDARY_STEPS:
+            user_end = Decimal(start) + Decimal(step)
+            user_end_z = float(user_end)
+            layer_number = _following_section_end_layer(start_z, lh, user_end_z)
+            actual_end_z = _snap_z(_z_at_layer(start_z, lh, layer_number)) if layer_number else None
+            baseline_end_z = _baseline_following_section_end(start_z, lh, user_end_z)
+            
+            if _is_whole_number_of_layers(user_end - Decimal(start), layer_height):
+                assert actual_end_z == user_end_z
+                assert baseline_end_z in (user_end_z, round(user_end_z + lh, 6))
+            else:
+                assert actual_end_z == baseline_end_z, (start, layer_height, user_end_z)
+
+
+def test_nested_section_overlaps_are_reported():
+    # C (30-40) lies inside A (0-100) even though it starts after B (10-20) ends
+    heights = [(0.0, 100.0), (10.0, 20.0), (30.0, 40.0)]
+    assert find_overlapping_sections(heights) == {1, 2}
+
+
+def test_overlaps_are_found_in_unsorted_input():
+    heights = [(5.0, 8.0), (0.0, 6.0), (8.0, None)]
+    assert find_overlapping_sections(heights) == {0}
+
+
+def test_adjacent_sections_and_missing_start_do_not_overlap():
+    heights = [(None, 5.0), (5.0, 10.0), (10.0, None)]
+    assert find_overlapping_sections(heights) == set()